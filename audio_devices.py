@@ -0,0 +1,157 @@
+"""In-process CoreAudio device queries, the same calls SwitchAudioSource makes"""
+import ctypes
+import logging
+
+logger = logging.getLogger(__name__)
+
+COREAUDIO_PATH = '/System/Library/Frameworks/CoreAudio.framework/CoreAudio'
+COREFOUNDATION_PATH = '/System/Library/Frameworks/CoreFoundation.framework/CoreFoundation'
+
+
+def _fourcc(code):
+    return int.from_bytes(code.encode('ascii'), 'big')
+
+
+kAudioObjectSystemObject = 1
+kAudioObjectPropertyScopeGlobal = _fourcc('glob')
+kAudioObjectPropertyElementMain = 0
+kAudioHardwarePropertyDevices = _fourcc('dev#')
+kAudioObjectPropertyName = _fourcc('lnam')
+kCFStringEncodingUTF8 = 0x08000100
+
+
+class AudioObjectPropertyAddress(ctypes.Structure):
+    _fields_ = [
+        ('mSelector', ctypes.c_uint32),
+        ('mScope', ctypes.c_uint32),
+        ('mElement', ctypes.c_uint32),
+    ]
+
+
+# OSStatus (*)(AudioObjectID, UInt32, const AudioObjectPropertyAddress *, void *)
+AudioObjectPropertyListenerProc = ctypes.CFUNCTYPE(
+    ctypes.c_int32, ctypes.c_uint32, ctypes.c_uint32,
+    ctypes.POINTER(AudioObjectPropertyAddress), ctypes.c_void_p
+)
+
+
+try:
+    _coreaudio = ctypes.CDLL(COREAUDIO_PATH)
+    _corefoundation = ctypes.CDLL(COREFOUNDATION_PATH)
+except OSError:
+    # Not on macOS (or the frameworks moved), callers fall back to SwitchAudioSource
+    _coreaudio = _corefoundation = None
+    AVAILABLE = False
+else:
+    _coreaudio.AudioObjectGetPropertyDataSize.argtypes = [
+        ctypes.c_uint32, ctypes.POINTER(AudioObjectPropertyAddress),
+        ctypes.c_uint32, ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint32)
+    ]
+    _coreaudio.AudioObjectGetPropertyDataSize.restype = ctypes.c_int32
+    _coreaudio.AudioObjectGetPropertyData.argtypes = [
+        ctypes.c_uint32, ctypes.POINTER(AudioObjectPropertyAddress),
+        ctypes.c_uint32, ctypes.c_void_p, ctypes.POINTER(ctypes.c_uint32), ctypes.c_void_p
+    ]
+    _coreaudio.AudioObjectGetPropertyData.restype = ctypes.c_int32
+    for _name in ('AudioObjectAddPropertyListener', 'AudioObjectRemovePropertyListener'):
+        getattr(_coreaudio, _name).argtypes = [
+            ctypes.c_uint32, ctypes.POINTER(AudioObjectPropertyAddress),
+            AudioObjectPropertyListenerProc, ctypes.c_void_p
+        ]
+        getattr(_coreaudio, _name).restype = ctypes.c_int32
+    _corefoundation.CFStringGetCString.argtypes = [
+        ctypes.c_void_p, ctypes.c_char_p, ctypes.c_long, ctypes.c_uint32
+    ]
+    _corefoundation.CFStringGetCString.restype = ctypes.c_bool
+    _corefoundation.CFRelease.argtypes = [ctypes.c_void_p]
+    _corefoundation.CFRelease.restype = None
+    AVAILABLE = True
+
+
+def _address(selector):
+    return AudioObjectPropertyAddress(
+        selector, kAudioObjectPropertyScopeGlobal, kAudioObjectPropertyElementMain
+    )
+
+
+def device_ids():
+    """Return the AudioDeviceIDs of every device CoreAudio knows about"""
+    address = _address(kAudioHardwarePropertyDevices)
+    size = ctypes.c_uint32(0)
+    status = _coreaudio.AudioObjectGetPropertyDataSize(
+        kAudioObjectSystemObject, ctypes.byref(address), 0, None, ctypes.byref(size)
+    )
+    if status:
+        raise OSError(f"AudioObjectGetPropertyDataSize failed with status {status}")
+
+    ids = (ctypes.c_uint32 * (size.value // ctypes.sizeof(ctypes.c_uint32)))()
+    status = _coreaudio.AudioObjectGetPropertyData(
+        kAudioObjectSystemObject, ctypes.byref(address), 0, None, ctypes.byref(size), ids
+    )
+    if status:
+        raise OSError(f"AudioObjectGetPropertyData failed with status {status}")
+
+    # The list can shrink between the two calls, size holds what was actually written
+    return list(ids[:size.value // ctypes.sizeof(ctypes.c_uint32)])
+
+
+def device_name(device_id):
+    """Return the name of one device, or None if CoreAudio can't tell us"""
+    address = _address(kAudioObjectPropertyName)
+    name_ref = ctypes.c_void_p()
+    size = ctypes.c_uint32(ctypes.sizeof(name_ref))
+    status = _coreaudio.AudioObjectGetPropertyData(
+        device_id, ctypes.byref(address), 0, None, ctypes.byref(size), ctypes.byref(name_ref)
+    )
+    if status or not name_ref.value:
+        return None
+
+    try:
+        buffer = ctypes.create_string_buffer(1024)
+        if not _corefoundation.CFStringGetCString(name_ref, buffer, len(buffer), kCFStringEncodingUTF8):
+            return None
+        return buffer.value.decode('utf-8')
+    finally:
+        # The name is returned with +1 retain count, we own it
+        _corefoundation.CFRelease(name_ref)
+
+
+def list_device_names():
+    """Return a frozenset with the names of all audio devices"""
+    return frozenset(name for name in map(device_name, device_ids()) if name)
+
+
+def has_device(names, fragment):
+    """Return whether any of the device names contains fragment"""
+    return any(fragment in name for name in names)
+
+
+def add_devices_listener(callback):
+    """Call callback() whenever a device is added or removed.
+
+    CoreAudio may call it from its own thread. Returns a handle for
+    remove_devices_listener; keep it alive for as long as the listener
+    is registered.
+    """
+    def listener(object_id, count, addresses, client_data):
+        try:
+            callback()
+        except Exception:
+            logger.exception("Device change callback failed")
+        return 0
+
+    proc = AudioObjectPropertyListenerProc(listener)
+    address = _address(kAudioHardwarePropertyDevices)
+    status = _coreaudio.AudioObjectAddPropertyListener(
+        kAudioObjectSystemObject, ctypes.byref(address), proc, None
+    )
+    if status:
+        raise OSError(f"AudioObjectAddPropertyListener failed with status {status}")
+    return proc
+
+
+def remove_devices_listener(proc):
+    address = _address(kAudioHardwarePropertyDevices)
+    _coreaudio.AudioObjectRemovePropertyListener(
+        kAudioObjectSystemObject, ctypes.byref(address), proc, None
+    )
@@ -50,24 +50,40 @@ import AVFoundation
 import objc
 import traceback  # Add this import
 import urllib.request
-import webbrowser
 import AppKit
 import ssl
-from setup_wizard import SetupWizard
+import certifi
+import audio_devices
 from utils import resource_path  # Import from utils instead of defining it here
 import atexit
-import tkinter as tk
-from tkinter import ttk
 import logging.handlers
 import errno
 import socket  # Add this with the other imports
 import json
 import tempfile
+import threading
 from datetime import datetime
 
 ICON_PATH = "icon.icns"
 ICON_RECORDING_PATH = "icon_recording.icns"
 
+# Shared TLS context for update checks (loading the cert store is not free).
+# The bundled python.org framework has no CA store of its own, so use certifi's
+_SSL_CTX = ssl.create_default_context(cafile=certifi.where())
+
+# AppleScripts run in-process via NSAppleScript (compiled once, see get_apple_script)
+CHOOSE_FOLDER_SCRIPT = '''
+with timeout of 600 seconds
+    tell application "System Events"
+        activate
+        set folderSelection to choose folder with prompt "Select Output Folder" default location path to desktop
+        set folderPath to POSIX path of folderSelection
+        return folderPath
+    end tell
+end timeout
+'''
+GET_VOLUME_SCRIPT = 'get volume settings'
+
 def setup_library_path():
     if getattr(sys, 'frozen', False):
         # Running in a bundle
@@ -92,7 +108,16 @@ class AdvancedAudioRecorderApp(rumps.App):
             # Initialize basic attributes first
             self.recording = False
             self.version = "1.0.0"
+            self._current_major = int(self.version.split('.')[0])
+            self._version_req_path = os.path.join(tempfile.gettempdir(), 'soundgrabber_version_requirement.json')
             self.audio_data = []
+            self._abs_max = 0
+            self._settings_cache = None
+            self._settings_stamp = None
+            self._version_req_cache = None
+            self._version_req_mtime = None
+            self._version_req_stored = None
+            self._apple_scripts = {}
             self.fs = 48000
             self.channels = 2
             self.stream = None
@@ -108,47 +133,9 @@ class AdvancedAudioRecorderApp(rumps.App):
             self.update_url = "https://raw.githubusercontent.com/madebyivans/SoundGrabber/main/version.txt"
             self.download_url = "https://github.com/madebyivans/SoundGrabber/releases"
             
-            logging.info("=== Starting Version Check ===")
-            logging.info(f"Current app version: {self.version}")
-            
-            # Try to check online version first
-            try:
-                # Bypass SSL verification
-                import ssl
-                ssl._create_default_https_context = ssl._create_unverified_context
-                
-                api_url = "https://api.github.com/repos/madebyivans/SoundGrabber/contents/version.txt"
-                logging.info(f"Checking online version at: {api_url}")
-                
-                request = urllib.request.Request(
-                    api_url,
-                    headers={
-                        'User-Agent': 'SoundGrabber',
-                        'Accept': 'application/vnd.github.v3.raw'
-                    }
-                )
-                
-                response = urllib.request.urlopen(request, timeout=5)
-                latest_version = response.read().decode('utf-8').strip()
-                logging.info(f"Server version: {latest_version}")
-                
-                # Store the latest version from server
-                self.store_version_requirement(latest_version)
-                
-            except Exception as e:
-                logging.warning(f"Could not check online version: {e}")
-                
-            # Now check stored version requirement
-            requirement_exists = self.check_stored_version_requirement()
-            logging.info(f"Version requirement check result: {requirement_exists}")
-            
-            if requirement_exists:
-                logging.critical("Version requirement not met. Exiting application.")
-                self.show_update_required_message()
-                AppKit.NSApp.terminate_(None)
-                return
-
-            logging.info("=== Version Check Complete ===")
+            # The online version check and the stored version requirement are
+            # handled by check_for_updates_in_background once the app is running,
+            # so no network or disk IO sits on the startup path
             
             # Get the actual app path using sys.executable
             app_dir = os.path.abspath(sys.executable)
@@ -191,12 +178,8 @@ class AdvancedAudioRecorderApp(rumps.App):
                 center_x = screen_frame.origin.x + (screen_frame.size.width - window_frame.size.width) / 2
                 center_y = screen_frame.origin.y + (screen_frame.size.height - window_frame.size.height) / 2
                 
-                # Set window position and bring to front
-                alert_window.setFrame_display_(
-                    AppKit.NSMakeRect(center_x, center_y, window_frame.size.width, window_frame.size.height),
-                    True
-                )
-                alert_window.makeKeyAndOrderFront_(None)
+                # Move the window without forcing a redraw; runModal makes it key
+                alert_window.setFrameOrigin_(AppKit.NSMakePoint(center_x, center_y))
                 alert_window.orderFrontRegardless()
                 
                 logging.info("Showing alert...")
@@ -274,7 +257,7 @@ class AdvancedAudioRecorderApp(rumps.App):
                             
                             # Launch the installed version
                             logging.info("Launching installed version...")
-                            subprocess.Popen(['open', dest_path])
+                            AppKit.NSWorkspace.sharedWorkspace().openURL_(AppKit.NSURL.fileURLWithPath_(dest_path))
                             
                             # Quit current instance
                             logging.info("Quitting current instance...")
@@ -285,8 +268,7 @@ class AdvancedAudioRecorderApp(rumps.App):
                             raise Exception(f"{action.capitalize()} failed")
                             
                     except Exception as e:
-                        logging.error(f"Installation error: {e}")
-                        logging.error(traceback.format_exc())
+                        logging.exception("Installation error: %s", e)
                         
                         # Show error to user
                         error_alert = AppKit.NSAlert.alloc().init()
@@ -304,8 +286,15 @@ class AdvancedAudioRecorderApp(rumps.App):
             
             self.icon_path = resource_path("resources/icon.icns")
             self.recording_icon_path = resource_path("resources/icon_recording.icns")
-            self.start_sound_path = resource_path("resources/start_recording.wav")
-            self.stop_sound_path = resource_path("resources/stop_recording.wav")
+            
+            # Feedback sounds by name, resolved and checked once instead of on every play
+            self.sound_paths = {}
+            for sound_name in ('start_recording.wav', 'stop_recording.wav'):
+                sound_path = resource_path(f"resources/{sound_name}")
+                if os.path.exists(sound_path):
+                    self.sound_paths[sound_name] = sound_path
+                else:
+                    logging.error(f"Sound file not found: {sound_path}")
             
             # Keep only these essential activation settings
             app = AppKit.NSApplication.sharedApplication()
@@ -351,10 +340,16 @@ class AdvancedAudioRecorderApp(rumps.App):
                 self.stream = None
                 self.previous_output_device = None
                 self.last_recorded_file = None
+                # Compile the menu's AppleScripts now rather than on first click
+                for source in (CHOOSE_FOLDER_SCRIPT, GET_VOLUME_SCRIPT):
+                    self.get_apple_script(source)
                 self.setup_menu()
                 request_microphone_access()
                 self.previous_input_device = None
                 rumps.Timer(self.check_recording_state, 5).start()
+                # Started here rather than from __main__ so the re-init after the
+                # setup wizard gets its update check too
+                self.check_for_updates_in_background()
             
             # Update these URLs
             self.version = "1.0.0"  # Current version
@@ -362,8 +357,7 @@ class AdvancedAudioRecorderApp(rumps.App):
             self.download_url = "https://github.com/madebyivans/SoundGrabber/releases"  # Updated to GitHub releases
 
         except Exception as e:
-            logging.error(f"Error during setup: {e}")
-            logging.error(traceback.format_exc())
+            logging.exception("Error during setup: %s", e)
             sys.exit(1)
 
     def setup_logging(self):
@@ -422,8 +416,7 @@ class AdvancedAudioRecorderApp(rumps.App):
         """
         try:
             # Log the full error with context
-            logging.error(f"Error in {context}: {str(error)}")
-            logging.error(traceback.format_exc())
+            logging.error("Error in %s: %s", context, error, exc_info=error)
             
             if show_to_user:
                 # Temporarily change activation policy to make alert visible
@@ -455,18 +448,27 @@ class AdvancedAudioRecorderApp(rumps.App):
                 # Handle "Show Log" button
                 if response == AppKit.NSAlertSecondButtonReturn:
                     log_dir = os.path.dirname(logging.getLoggerClass().root.handlers[0].baseFilename)
-                    subprocess.run(['open', log_dir])
+                    AppKit.NSWorkspace.sharedWorkspace().openURL_(AppKit.NSURL.fileURLWithPath_(log_dir))
                 
                 # Restore previous activation policy
                 app.setActivationPolicy_(previous_policy)
                 
         except Exception as e:
             # If error handling fails, at least try to log it
-            logging.critical(f"Error handler failed: {e}")
-            logging.critical(traceback.format_exc())
+            logging.critical("Error handler failed: %s", e, exc_info=True)
 
     def load_settings(self):
         settings_path = '/Users/ivans/Desktop/app/audio_recorder_settings.txt'
+        
+        # Reuse the parsed settings while the file is unchanged on disk
+        try:
+            st = os.stat(settings_path)
+            settings_stamp = (st.st_mtime, st.st_size)
+        except OSError:
+            settings_stamp = None
+        if settings_stamp is not None and settings_stamp == self._settings_stamp:
+            return dict(self._settings_cache)
+        
         settings = {
             'output_folder': os.path.expanduser('~/Desktop'),
             'recording_name': 'recording'
@@ -480,21 +482,31 @@ class AdvancedAudioRecorderApp(rumps.App):
                         if len(parts) == 2:
                             key, value = parts
                             settings[key.strip()] = value.strip()
+            self._settings_cache = dict(settings)
+            self._settings_stamp = settings_stamp
         except FileNotFoundError:
             logging.warning(f"Settings file not found at {settings_path}. Using default settings.")
             self.save_settings(settings)
         except Exception as e:
-            logging.error(f"Error loading settings: {e}")
-            logging.error(traceback.format_exc())
+            logging.exception("Error loading settings: %s", e)
         return settings
 
     def save_settings(self, settings=None):
         if settings is None:
             settings = self.settings
+        
+        # Only write when the settings differ from what's on disk
+        if settings == self._settings_cache:
+            return
+        
         settings_path = '/Users/ivans/Desktop/app/audio_recorder_settings.txt'
         with open(settings_path, 'w') as f:
             for key, value in settings.items():
                 f.write(f"{key}={value}\n")
+        
+        st = os.stat(settings_path)
+        self._settings_cache = dict(settings)
+        self._settings_stamp = (st.st_mtime, st.st_size)
 
     def setup_menu(self):
         # Create Settings submenu
@@ -577,6 +589,7 @@ class AdvancedAudioRecorderApp(rumps.App):
             
             # Clear audio data before starting new recording
             self.audio_data = []
+            self._abs_max = 0
             self.channels = 2
             
             logging.info("Setting up audio devices...")
@@ -619,8 +632,7 @@ class AdvancedAudioRecorderApp(rumps.App):
             self.icon = self.recording_icon_path
 
         except Exception as e:
-            logging.error(f"Error starting recording: {str(e)}")
-            logging.error(traceback.format_exc())
+            logging.exception("Error starting recording: %s", e)
 
     def stop_recording(self):
         try:
@@ -657,8 +669,7 @@ class AdvancedAudioRecorderApp(rumps.App):
             logging.info("Recording stopped successfully")
             
         except Exception as e:
-            logging.error(f"Error stopping recording: {str(e)}")
-            logging.error(traceback.format_exc())
+            logging.exception("Error stopping recording: %s", e)
         finally:
             # Ensure we always try to restore devices
             try:
@@ -679,14 +690,11 @@ class AdvancedAudioRecorderApp(rumps.App):
 
             logging.info("=== Starting Audio Save Process ===")
             start_time = time.time()
-            audio_array = np.concatenate(self.audio_data, axis=0)
-            logging.info(f"Raw audio array shape: {audio_array.shape}, dtype: {audio_array.dtype}")
 
-            # Check signal levels
-            rms = np.sqrt(np.mean(audio_array**2))
-            logging.info(f"Audio RMS level: {rms}")
+            # Check signal levels using the peak tracked during recording
+            logging.info("Audio peak level: %s", self._abs_max)
             
-            if rms < 1e-6:  # Adjust threshold as needed
+            if self._abs_max == 0:  # Nothing but digital silence
                 logging.error("No signal detected in recording")
                 
                 # Stop recording first
@@ -717,18 +725,21 @@ class AdvancedAudioRecorderApp(rumps.App):
                     self.open_audio_midi_setup(None)
                 return
 
+            audio_array = np.concatenate(self.audio_data, axis=0)
+            logging.info("Raw audio array shape: %s, dtype: %s", audio_array.shape, audio_array.dtype)
+
             # Trim silence from start and end
             logging.info("Trimming silence from start and end")
             trimmed_audio, start_trim, end_trim = self.trim_silence_int32(audio_array)
-            logging.info(f"Trimmed {start_trim} samples from start, {end_trim} samples from end")
+            logging.info("Trimmed %d samples from start, %d samples from end", start_trim, end_trim)
 
             # Find the first transient in the trimmed audio
             transient_start = self.find_first_transient(trimmed_audio)
-            logging.info(f"First transient found at sample: {transient_start}")
+            logging.info("First transient found at sample: %s", transient_start)
 
             # Further trim the audio to start at the first transient
             final_audio = trimmed_audio[transient_start:]
-            logging.info(f"Final audio shape after transient trimming: {final_audio.shape}")
+            logging.info("Final audio shape after transient trimming: %s", final_audio.shape)
 
             # Apply initial fade if no trimming occurred (audio was already playing)
             if start_trim == 0 and transient_start == 0:
@@ -794,8 +805,7 @@ class AdvancedAudioRecorderApp(rumps.App):
                 logging.error("File was not created")
             
         except Exception as e:
-            logging.error(f"Error saving audio file: {e}")
-            logging.error(traceback.format_exc())
+            logging.exception("Error saving audio file: %s", e)
 
     def find_first_transient(self, audio, threshold_db=-20, window_size=1024):
         threshold_linear = 10 ** (threshold_db / 20) * np.iinfo(np.int32).max
@@ -810,15 +820,19 @@ class AdvancedAudioRecorderApp(rumps.App):
 
     def audio_callback(self, indata, frames, time_info, status):
         if status:
-            logging.warning(f"Audio callback status: {status}")
+            logging.warning("Audio callback status: %s", status)
         self.last_callback_time = time.time()
         
         if self.recording:
             self.audio_data.append(indata.copy())
+            # Track the running peak so silent recordings can be skipped on save
+            peak = max(int(indata.max()), -int(indata.min()))
+            if peak > self._abs_max:
+                self._abs_max = peak
             # Add occasional audio data logging
             if len(self.audio_data) % 100 == 0:
-                logging.info(f"Audio stats: shape={indata.shape}, max_value={np.max(np.abs(indata))}")
-                logging.info(f"Total chunks recorded: {len(self.audio_data)}")
+                logging.info("Audio stats: shape=%s, max_value=%s", indata.shape, peak)
+                logging.info("Total chunks recorded: %d", len(self.audio_data))
 
     def find_switch_audio_source(self):
         """Look for SwitchAudioSource in multiple locations"""
@@ -870,8 +884,7 @@ class AdvancedAudioRecorderApp(rumps.App):
             # Then quit the application
             rumps.quit_application()
         except Exception as e:
-            logging.error(f"Error during quit: {e}")
-            logging.error(traceback.format_exc())
+            logging.exception("Error during quit: %s", e)
             # Still try to quit even if cleanup fails
             rumps.quit_application()
 
@@ -879,8 +892,8 @@ class AdvancedAudioRecorderApp(rumps.App):
         threshold_linear = int(10 ** (threshold_db / 20) * np.iinfo(np.int32).max)
         min_silence_samples = int(min_silence_ms * self.fs / 1000)
 
-        # Use vectorized operations for faster processing
-        is_silent = np.all(np.abs(audio_array) < threshold_linear, axis=1)
+        # Per-frame min/max reductions instead of a full abs() buffer
+        is_silent = (audio_array.max(axis=1) < threshold_linear) & (audio_array.min(axis=1) > -threshold_linear)
         
         # Find the first non-silent sample
         start_trim = np.argmax(~is_silent)
@@ -891,7 +904,7 @@ class AdvancedAudioRecorderApp(rumps.App):
         end_trim = len(is_silent) - np.argmax(~is_silent[::-1])
         end_trim = min(end_trim + min_silence_samples, len(is_silent))
 
-        logging.info(f"Trim analysis: start_trim={start_trim}, end_trim={end_trim}, total_samples={audio_array.shape[0]}")
+        logging.info("Trim analysis: start_trim=%d, end_trim=%d, total_samples=%d", start_trim, end_trim, audio_array.shape[0])
         
         # Check if the entire track is below the threshold
         if start_trim >= end_trim:
@@ -900,7 +913,8 @@ class AdvancedAudioRecorderApp(rumps.App):
 
         trimmed_audio = audio_array[start_trim:end_trim]
         
-        logging.debug(f"Trimmed {start_trim} samples from start and {audio_array.shape[0] - end_trim} samples from end")
+        logging.debug("Trimmed %d samples from start and %d samples from end",
+                      start_trim, audio_array.shape[0] - end_trim)
         
         return trimmed_audio, start_trim, end_trim
 
@@ -951,42 +965,49 @@ class AdvancedAudioRecorderApp(rumps.App):
             for recording in recordings:
                 file_path = os.path.join(output_folder, recording)
                 if os.path.exists(file_path):
-                    subprocess.run(['open', '-R', file_path])
+                    AppKit.NSWorkspace.sharedWorkspace().activateFileViewerSelectingURLs_(
+                        [AppKit.NSURL.fileURLWithPath_(file_path)]
+                    )
                     logging.info(f"Showed recording in Finder: {file_path}")
                     return
         
         # If no recordings found or all were deleted, show the output folder
-        subprocess.run(['open', output_folder])
+        AppKit.NSWorkspace.sharedWorkspace().openURL_(AppKit.NSURL.fileURLWithPath_(output_folder))
         logging.info(f"No recordings found. Showed output folder in Finder: {output_folder}")
 
     def edit_settings(self, _):
         try:
             current_name = self.settings.get('recording_name', 'recording')
             
-            # Create AppleScript command with basic styling and proper window positioning
-            apple_script = f'''
-            tell application "System Events"
-                activate
-                set folderSelection to choose folder with prompt "Select Output Folder" default location path to desktop
-                set folderPath to POSIX path of folderSelection
-                return folderPath
-            end tell
-            '''
-            
-            # Run AppleScript and get result
-            result = subprocess.run(['osascript', '-e', apple_script], 
-                                  capture_output=True, text=True)
+            # Run the folder picker in-process instead of spawning osascript
+            result = self.run_apple_script(CHOOSE_FOLDER_SCRIPT)
             
-            if result.returncode == 0:
-                new_folder = result.stdout.strip()
+            if result is not None:
+                new_folder = result.stringValue()
                 if new_folder:
                     self.settings['output_folder'] = new_folder
                     self.save_settings()
                     logging.info(f"Updated output folder to: {new_folder}")
                 
         except Exception as e:
-            logging.error(f"Error editing settings: {e}")
-            logging.error(traceback.format_exc())
+            logging.exception("Error editing settings: %s", e)
+
+    def get_apple_script(self, source):
+        """Return a compiled NSAppleScript for source, compiling it only once"""
+        script = self._apple_scripts.get(source)
+        if script is None:
+            script = AppKit.NSAppleScript.alloc().initWithSource_(source)
+            script.compileAndReturnError_(None)
+            self._apple_scripts[source] = script
+        return script
+
+    def run_apple_script(self, source):
+        """Run an AppleScript in-process; returns the result descriptor or None on error"""
+        result, error = self.get_apple_script(source).executeAndReturnError_(None)
+        if error is not None:
+            logging.warning(f"AppleScript failed: {error.get('NSAppleScriptErrorMessage', error)}")
+            return None
+        return result
 
     def reload_settings(self, _):
         try:
@@ -1021,13 +1042,13 @@ class AdvancedAudioRecorderApp(rumps.App):
             logging.error(f"Failed to switch input to {device}: {e}")
 
     def play_sound(self, sound_name):
-        sound_path = os.path.join(os.path.dirname(__file__), 'resources', sound_name)
+        sound_path = self.sound_paths.get(sound_name)
+        if sound_path is None:
+            return  # missing, already logged at startup
         logging.info(f"Attempting to play sound: {sound_path}")
-        if not os.path.exists(sound_path):
-            logging.error(f"Sound file not found: {sound_path}")
-            return
         try:
-            os.system(f"afplay {sound_path}")
+            # Exec afplay directly; os.system went through /bin/sh and broke on spaces in the path
+            subprocess.run(['afplay', sound_path])
             logging.info(f"Sound played successfully: {sound_name}")
         except Exception as e:
             logging.error(f"Failed to play sound {sound_name}: {e}")
@@ -1065,17 +1086,22 @@ class AdvancedAudioRecorderApp(rumps.App):
     def periodic_check(self, _):
         logging.info("Periodic check: Application is still running")
 
+    def check_for_updates_in_background(self):
+        """Run the silent startup update check on a worker thread"""
+        threading.Thread(target=self.check_for_updates, kwargs={'silent': True}, daemon=True).start()
+
+    def run_on_main_thread(self, func):
+        """Schedule func on the main thread; menus and alerts must not be touched from workers"""
+        AppKit.NSOperationQueue.mainQueue().addOperationWithBlock_(func)
+
+    def require_update_and_quit(self):
+        self.show_update_required_message()
+        AppKit.NSApp.terminate_(None)
+
     def check_for_updates(self, sender=None, silent=False):
+        # Network and file IO run on the calling thread (a worker at startup);
+        # everything that touches the UI goes through run_on_main_thread
         try:
-            # Remove existing update menu item if it exists
-            for item in list(self.menu):
-                if isinstance(item, rumps.MenuItem) and item.title.startswith("Update Available"):
-                    self.menu.remove(item)
-        
-            # Bypass SSL verification
-            import ssl
-            ssl._create_default_https_context = ssl._create_unverified_context
-            
             # Use GitHub API
             api_url = "https://api.github.com/repos/madebyivans/SoundGrabber/contents/version.txt"
             
@@ -1089,7 +1115,7 @@ class AdvancedAudioRecorderApp(rumps.App):
                 }
             )
             
-            response = urllib.request.urlopen(request, timeout=5)
+            response = urllib.request.urlopen(request, timeout=5, context=_SSL_CTX)
             latest_version = response.read().decode('utf-8').strip()
             
             logging.info(f"Latest version from server: {latest_version}")
@@ -1098,61 +1124,66 @@ class AdvancedAudioRecorderApp(rumps.App):
             self.store_version_requirement(latest_version)
             
             # Check if major version update is available
-            current_major = int(self.version.split('.')[0])
             latest_major = int(latest_version.split('.')[0])
             
-            if latest_major > current_major:
+            if latest_major > self._current_major:
                 logging.warning("Major version update required")
-                self.show_update_required_message()
-                AppKit.NSApp.terminate_(None)
+                self.run_on_main_thread(self.require_update_and_quit)
                 return
             
-            # For non-major updates, continue with normal update notification
-            elif latest_version > self.version:
-                self.menu.insert_before(
-                    "Check for Updates",
-                    rumps.MenuItem(
-                        f"Update Available ({latest_version})",
-                        callback=self.download_update
-                    )
-                )
+            def show_result():
+                # Remove existing update menu item if it exists
+                for item in list(self.menu.values()):
+                    if isinstance(item, rumps.MenuItem) and item.title.startswith("Update Available"):
+                        del self.menu[item.title]
                 
-                if not silent:
+                # For non-major updates, continue with normal update notification
+                if latest_version > self.version:
+                    self.menu.insert_before(
+                        "Check for Updates",
+                        rumps.MenuItem(
+                            f"Update Available ({latest_version})",
+                            callback=self.download_update
+                        )
+                    )
+                    
+                    if not silent:
+                        rumps.notification(
+                            title="SoundGrabber Update Available",
+                            subtitle=f"Version {latest_version} is available",
+                            message="Click 'Update Available' in the menu to download."
+                        )
+                elif not silent:
                     rumps.notification(
-                        title="SoundGrabber Update Available",
-                        subtitle=f"Version {latest_version} is available",
-                        message="Click 'Update Available' in the menu to download."
+                        title="SoundGrabber",
+                        subtitle="No Updates Available",
+                        message=f"You're running the latest version ({self.version})"
                     )
-            elif not silent:
-                rumps.notification(
-                    title="SoundGrabber",
-                    subtitle="No Updates Available",
-                    message=f"You're running the latest version ({self.version})"
-                )
+            
+            self.run_on_main_thread(show_result)
             
         except (urllib.error.URLError, urllib.error.HTTPError, socket.timeout) as e:
             # Handle connection errors
             logging.warning(f"Could not check for updates (connection error): {e}")
             # When offline, fall back to stored version requirement
             if self.check_stored_version_requirement():
-                self.show_update_required_message()
-                AppKit.NSApp.terminate_(None)
+                self.run_on_main_thread(self.require_update_and_quit)
                 return
             
             if not silent:
-                rumps.notification(
+                self.run_on_main_thread(lambda: rumps.notification(
                     title="SoundGrabber",
                     subtitle="Update Check Failed",
                     message="Could not check for updates. Will continue with current version."
-                )
+                ))
             return
             
         except Exception as e:
-            logging.error(f"Error checking for updates: {str(e)}")
-            logging.error(traceback.format_exc())
+            logging.exception("Error checking for updates: %s", e)
 
     def download_update(self, sender=None):
         try:
+            import webbrowser  # Only needed when the user asks for the update
             webbrowser.open(self.download_url)
         except Exception as e:
             logging.error(f"Error opening download page: {e}")
@@ -1179,7 +1210,7 @@ class AdvancedAudioRecorderApp(rumps.App):
                 response = alert.runModal()
                 
                 if response == AppKit.NSAlertFirstButtonReturn:  # "Install" clicked
-                    subprocess.run(['open', installer_path])
+                    AppKit.NSWorkspace.sharedWorkspace().openURL_(AppKit.NSURL.fileURLWithPath_(installer_path))
                     return False
                 return False
             return True
@@ -1219,6 +1250,12 @@ class AdvancedAudioRecorderApp(rumps.App):
     def needs_setup(self):
         """Check if any components need to be set up"""
         try:
+            if audio_devices.AVAILABLE:
+                # One in-process CoreAudio enumeration answers both questions
+                names = audio_devices.list_device_names()
+                return not (audio_devices.has_device(names, 'BlackHole 2ch') and
+                            audio_devices.has_device(names, 'SoundGrabber'))
+            
             # Check BlackHole
             devices = sd.query_devices()
             blackhole_exists = any('BlackHole 2ch' in str(device['name']) for device in devices)
@@ -1227,8 +1264,8 @@ class AdvancedAudioRecorderApp(rumps.App):
                 
             # Check Multi-Output Device
             result = subprocess.run([self.switch_audio_source_path, '-a'], 
-                                 capture_output=True, text=True)
-            if "SoundGrabber" not in result.stdout:
+                                 capture_output=True)
+            if b"SoundGrabber" not in result.stdout:
                 return True
                 
             return False
@@ -1241,11 +1278,14 @@ class AdvancedAudioRecorderApp(rumps.App):
         """Run the setup wizard"""
         try:
             logging.info("Starting setup wizard...")
+            # Only imported on first run, a set-up install never loads the wizard
+            from setup_wizard import SetupWizard
             wizard = SetupWizard()
             wizard.show()
             
-            # Run the wizard's event loop
-            AppKit.NSApp.run()
+            # Run the wizard's event loop, there is no window when everything is already set up
+            if not wizard.already_done:
+                AppKit.NSApp.run()
             
             # After wizard completes, verify everything is set up
             if self.needs_setup():
@@ -1262,8 +1302,7 @@ class AdvancedAudioRecorderApp(rumps.App):
                 self.run()
         
         except Exception as e:
-            logging.error(f"Error during setup wizard: {e}")
-            logging.error(traceback.format_exc())
+            logging.exception("Error during setup wizard: %s", e)
             AppKit.NSApp.terminate_(None)
 
     def set_blackhole_gain(self, gain_db):
@@ -1282,24 +1321,25 @@ class AdvancedAudioRecorderApp(rumps.App):
             '''
             
             # Get volume before change
-            before_vol = subprocess.run(['osascript', '-e', 'get volume settings'], 
-                                      capture_output=True, text=True).stdout.strip()
+            before_vol = self.run_apple_script(GET_VOLUME_SCRIPT)
             
-            # Set the volume
-            subprocess.run(['osascript', '-e', apple_script], check=True)
+            # Set the volume, run_apple_script only logs the AppleScript error itself
+            if self.run_apple_script(apple_script) is None:
+                logging.error("Error setting BlackHole gain: could not set input volume to %s", gain_percent)
+                return
             
             # Get volume after change
-            after_vol = subprocess.run(['osascript', '-e', 'get volume settings'], 
-                                     capture_output=True, text=True).stdout.strip()
+            after_vol = self.run_apple_script(GET_VOLUME_SCRIPT)
             
-            logging.info(f"BlackHole 2ch volume adjustment - Before: {before_vol}, After: {after_vol}")
+            logging.info("BlackHole 2ch volume adjustment - Before: %s, After: %s",
+                         before_vol.stringValue() if before_vol is not None else None,
+                         after_vol.stringValue() if after_vol is not None else None)
             
         except subprocess.CalledProcessError as e:
             logging.error(f"Error setting BlackHole gain: {e}")
             logging.error(f"Command output: {e.output if hasattr(e, 'output') else 'No output'}")
         except Exception as e:
-            logging.error(f"Unexpected error setting BlackHole gain: {e}")
-            logging.error(traceback.format_exc())
+            logging.exception("Unexpected error setting BlackHole gain: %s", e)
 
     def cleanup_on_exit(self):
         """Ensure proper cleanup when app exits"""
@@ -1325,8 +1365,7 @@ class AdvancedAudioRecorderApp(rumps.App):
             logging.info("Cleanup completed successfully")
             
         except Exception as e:
-            logging.error(f"Error during cleanup: {e}")
-            logging.error(traceback.format_exc())
+            logging.exception("Error during cleanup: %s", e)
 
     def terminate_(self, sender):
         try:
@@ -1340,14 +1379,13 @@ class AdvancedAudioRecorderApp(rumps.App):
                     self.switch_to_device(self.previous_output_device)
                     logging.info(f"Restored output device to: {self.previous_output_device}")
         except Exception as e:
-            logging.error(f"Error during terminate: {e}")
-            logging.error(traceback.format_exc())
+            logging.exception("Error during terminate: %s", e)
         finally:
             super().terminate_(sender)
 
     def open_audio_midi_setup(self, _):
         try:
-            subprocess.run(['open', '-a', 'Audio MIDI Setup'])
+            AppKit.NSWorkspace.sharedWorkspace().launchApplication_("Audio MIDI Setup")
         except Exception as e:
             logging.error(f"Error opening Audio MIDI Setup: {e}")
 
@@ -1355,55 +1393,64 @@ class AdvancedAudioRecorderApp(rumps.App):
         try:
             current_name = self.settings.get('recording_name', 'recording')
             
-            # Create AppleScript command with basic styling
-            apple_script = f'''
-            tell application "System Events"
-                display dialog "Enter the base name for your recordings:" ¬
-                    default answer "{current_name}" ¬
-                    with title "Set Recording Name" ¬
-                    buttons {{"Cancel", "Save"}} ¬
-                    default button "Save"
-            end tell
-            '''
+            # Native text-input alert instead of an osascript dialog
+            alert = AppKit.NSAlert.alloc().init()
+            alert.setMessageText_("Set Recording Name")
+            alert.setInformativeText_("Enter the base name for your recordings:")
+            alert.addButtonWithTitle_("Save")
+            alert.addButtonWithTitle_("Cancel")
             
-            # Run AppleScript and get result
-            result = subprocess.run(['osascript', '-e', apple_script], 
-                                  capture_output=True, text=True)
+            name_field = AppKit.NSTextField.alloc().initWithFrame_(AppKit.NSMakeRect(0, 0, 240, 24))
+            name_field.setStringValue_(current_name)
+            alert.setAccessoryView_(name_field)
+            alert.window().setInitialFirstResponder_(name_field)
+            
+            response = self.show_centered_alert(alert)
             
-            if result.returncode == 0:  # User clicked Save
-                # Parse the result to get the text
-                new_name = result.stdout.strip()
-                if new_name and "text returned:" in new_name:
-                    new_name = new_name.split("text returned:")[1].strip()
+            if response == AppKit.NSAlertFirstButtonReturn:  # User clicked Save
+                new_name = name_field.stringValue().strip()
+                if new_name:
                     self.settings['recording_name'] = new_name
                     self.save_settings()
                     logging.info(f"Updated recording name to: {new_name}")
             
         except Exception as e:
-            logging.error(f"Error editing recording name: {e}")
-            logging.error(traceback.format_exc())
+            logging.exception("Error editing recording name: %s", e)
 
     def open_settings_file(self, _):
         try:
             settings_path = '/Users/ivans/Desktop/app/audio_recorder_settings.txt'
-            subprocess.run(['open', '-t', settings_path])  # Opens with default text editor
+            AppKit.NSWorkspace.sharedWorkspace().openFile_withApplication_(settings_path, None)  # Opens with default app for .txt
         except Exception as e:
-            logging.error(f"Error opening settings file: {e}")
-            logging.error(traceback.format_exc())
+            logging.exception("Error opening settings file: %s", e)
 
     def check_stored_version_requirement(self):
         """Check if there's a stored version requirement that hasn't been met"""
         try:
-            requirement_file = os.path.join(tempfile.gettempdir(), 'soundgrabber_version_requirement.json')
-            if os.path.exists(requirement_file):
-                with open(requirement_file, 'r') as f:
-                    data = json.load(f)
-                    required_version = data.get('required_version')
-                    if required_version:
-                        current_major = int(self.version.split('.')[0])
-                        required_major = int(required_version.split('.')[0])
-                        return required_major > current_major
-            return False
+            try:
+                f = open(self._version_req_path, 'rb')
+            except FileNotFoundError:
+                self._version_req_mtime = None
+                self._version_req_stored = None
+                return False
+            
+            with f:
+                # Only re-parse the file when it changed since the last check
+                mtime = os.fstat(f.fileno()).st_mtime
+                if mtime == self._version_req_mtime:
+                    return self._version_req_cache
+                
+                requirement_not_met = False
+                data = json.loads(f.read())
+                required_version = data.get('required_version')
+                self._version_req_stored = required_version
+                if required_version:
+                    required_major = int(required_version.split('.')[0])
+                    requirement_not_met = required_major > self._current_major
+            
+            self._version_req_mtime = mtime
+            self._version_req_cache = requirement_not_met
+            return requirement_not_met
         except Exception as e:
             logging.error("Version check error")
             return False
@@ -1411,24 +1458,37 @@ class AdvancedAudioRecorderApp(rumps.App):
     def store_version_requirement(self, required_version):
         """Store the version requirement persistently"""
         try:
-            requirement_file = os.path.join(tempfile.gettempdir(), 'soundgrabber_version_requirement.json')
-            
-            # Always remove existing file first
-            if os.path.exists(requirement_file):
-                os.remove(requirement_file)
+            requirement_file = self._version_req_path
             
             # Parse versions
             required_major = int(required_version.split('.')[0])
-            current_major = int(self.version.split('.')[0])
+            current_major = self._current_major
             
-            # If server version is 1.x.x or lower than current, don't store anything
+            # If server version is 1.x.x or lower than current, clear any stored requirement
             if required_major <= 1 or required_major <= current_major:
+                try:
+                    os.remove(requirement_file)
+                except FileNotFoundError:
+                    pass
+                self._version_req_mtime = None
+                self._version_req_cache = None
+                self._version_req_stored = None
                 return
             
-            # Only store if it's a higher major version
-            if required_major > current_major:
-                with open(requirement_file, 'w') as f:
-                    json.dump({'required_version': required_version}, f)
+            # Nothing to write if this exact requirement is already stored
+            if required_version == self._version_req_stored:
+                return
+            
+            # Write to a temp file and swap it in so the file is never missing or partial
+            tmp_file = requirement_file + '.tmp'
+            with open(tmp_file, 'w') as f:
+                json.dump({'required_version': required_version}, f)
+            os.replace(tmp_file, requirement_file)
+            
+            # Write-through so the next check doesn't re-read the file
+            self._version_req_mtime = os.stat(requirement_file).st_mtime
+            self._version_req_cache = True
+            self._version_req_stored = required_version
         
         except Exception:
             pass  # Silently fail
@@ -1448,6 +1508,7 @@ class AdvancedAudioRecorderApp(rumps.App):
             response = self.show_centered_alert(alert)
             
             if response == AppKit.NSAlertFirstButtonReturn:  # "Update Now"
+                import webbrowser  # Only needed when the user asks for the update
                 webbrowser.open("https://madebyivans.gumroad.com/l/soundgrabber")
             
         except Exception as e:
@@ -1456,10 +1517,15 @@ class AdvancedAudioRecorderApp(rumps.App):
     def show_centered_alert(self, alert):
         """Helper method to show an alert centered and in front"""
         try:
-            # Temporarily change activation policy and bring app to front
+            # Temporarily change activation policy and bring app to front,
+            # skipping the Dock round-trips when we're already there
             app = AppKit.NSApplication.sharedApplication()
-            app.setActivationPolicy_(AppKit.NSApplicationActivationPolicyRegular)
-            app.activateIgnoringOtherApps_(True)
+            previous_policy = app.activationPolicy()
+            policy_changed = previous_policy != AppKit.NSApplicationActivationPolicyRegular
+            if policy_changed:
+                app.setActivationPolicy_(AppKit.NSApplicationActivationPolicyRegular)
+            if not app.isActive():
+                app.activateIgnoringOtherApps_(True)
             
             # Center and show alert
             alert_window = alert.window()
@@ -1471,19 +1537,16 @@ class AdvancedAudioRecorderApp(rumps.App):
             center_x = screen_frame.origin.x + (screen_frame.size.width - window_frame.size.width) / 2
             center_y = screen_frame.origin.y + (screen_frame.size.height - window_frame.size.height) / 2
             
-            # Set window position and bring to front
-            alert_window.setFrame_display_(
-                AppKit.NSMakeRect(center_x, center_y, window_frame.size.width, window_frame.size.height),
-                True
-            )
-            alert_window.makeKeyAndOrderFront_(None)
+            # Move the window without forcing a redraw; runModal makes it key
+            alert_window.setFrameOrigin_(AppKit.NSMakePoint(center_x, center_y))
             alert_window.orderFrontRegardless()
             
             # Show alert
             response = alert.runModal()
             
-            # Return to accessory app status
-            app.setActivationPolicy_(AppKit.NSApplicationActivationPolicyProhibited)
+            # Return to accessory app status if we left it
+            if policy_changed:
+                app.setActivationPolicy_(AppKit.NSApplicationActivationPolicyProhibited)
             
             return response
             
@@ -1494,7 +1557,6 @@ class AdvancedAudioRecorderApp(rumps.App):
 if __name__ == "__main__":
     try:
         app = AdvancedAudioRecorderApp()
-        app.check_for_updates(silent=True)
         
         # Add cleanup handler
         atexit.register(app.cleanup_on_exit)
@@ -1503,13 +1565,20 @@ if __name__ == "__main__":
         app.run()
         
     except Exception as e:
-        logging.critical(f"Fatal error: {str(e)}")
-        logging.critical(traceback.format_exc())
+        logging.critical("Fatal error: %s", e, exc_info=True)
         
         # Move crash log to app directory instead of Desktop
         crash_log_path = os.path.expanduser('~/.soundgrabber/crash.log')
-        with open(crash_log_path, 'w') as f:
-            f.write(f"SoundGrabber Crash Report\n")
-            f.write(f"Version: {app.version if 'app' in locals() else 'Unknown'}\n")
-            f.write(f"Time: {datetime.now()}\n\n")
-            f.write(traceback.format_exc())
+        report = (
+            "SoundGrabber Crash Report\n"
+            f"Version: {app.version if 'app' in locals() else 'Unknown'}\n"
+            f"Time: {datetime.now()}\n\n"
+            f"{traceback.format_exc()}"
+        )
+        try:
+            os.makedirs(os.path.dirname(crash_log_path), exist_ok=True)
+            # Single write so a partial report is never left behind
+            with open(crash_log_path, 'wb') as f:
+                f.write(report.encode('utf-8'))
+        except OSError as write_error:
+            logging.critical(f"Could not write crash log: {write_error}")
@@ -91,6 +91,7 @@ OPTIONS = {
         'binascii',
         'zlib',
         'PIL',
+        'certifi',
         'numpy',
         'sounddevice',
         'soundfile',
@@ -194,9 +195,10 @@ def fix_permissions():
         'resources/stop_recording.wav',
     ]
     
-    # Set executable permissions
+    # Set executable permissions once here so the bundled SwitchAudioSource
+    # ships with +x and the app never has to chmod it at runtime
     for file in executables:
-        if os.path.exists(file):
+        if os.path.exists(file) and not os.access(file, os.X_OK):
             os.chmod(file, stat.S_IRUSR | stat.S_IWUSR | stat.S_IXUSR | 
                           stat.S_IRGRP | stat.S_IXGRP |
                           stat.S_IROTH | stat.S_IXOTH)
@@ -1,66 +1,254 @@
+import atexit
 import os
 import logging
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
+import queue
 import subprocess
 import AppKit
 import Foundation
-import AVKit
 import time
-import traceback
+import threading
 from utils import resource_path
-import json
-import plistlib
-import AVFoundation
+import audio_devices
 import sys
-import tempfile
-import shutil
+
+logger = logging.getLogger(__name__)
+
+# Paths that never change while the wizard runs
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+MAIN_SCRIPT = os.path.join(APP_DIR, 'audio_recorder.py')
+LOG_DIR = os.path.join(os.path.expanduser('~'), '.soundgrabber')
+LOG_FILE = os.path.join(LOG_DIR, 'setup_wizard.log')
+BLACKHOLE_INSTALLER = resource_path('installers/BlackHole2ch-0.6.0.pkg')
+BLACKHOLE_INSTALLER_EXISTS = os.path.exists(BLACKHOLE_INSTALLER)
+SWITCH_AUDIO_SOURCE = resource_path('resources/SwitchAudioSource')
+SWITCH_AUDIO_SOURCE_EXISTS = os.path.exists(SWITCH_AUDIO_SOURCE)
+ICON_PATH = resource_path('resources/icon.icns')
+SETUP_RES_DIR = resource_path(os.path.join('resources', 'setup'))
+GUIDE_VIDEO = os.path.join(SETUP_RES_DIR, 'guide.mp4')
+
+# How often and how long to wait for the BlackHole installer to finish
+POLL_TIMEOUT = 120.0  # the installer waits on the user's password
+POLL_FIRST_DELAY = 0.5
+POLL_MAX_DELAY = 8.0
+
+# Audio MIDI Setup's bundle identifier, and where it lives if Launch Services can't say
+AUDIO_MIDI_SETUP_ID = "com.apple.audio.AudioMIDISetup"
+AUDIO_MIDI_SETUP_PATH = "/System/Applications/Utilities/Audio MIDI Setup.app"
+
+# Both device checks share one device listing for this long
+DEVICE_CACHE_TTL = 2.0
+
+# Wizard layout (x, y, width, height), made into NSRects once instead of per view
+FRAME_WINDOW = AppKit.NSMakeRect(0, 0, 800, 600)
+FRAME_TITLE = AppKit.NSMakeRect(40, 520, 720, 40)
+FRAME_IMAGE = AppKit.NSMakeRect(40, 180, 720, 320)
+FRAME_TEXT = AppKit.NSMakeRect(40, 20, 520, 140)
+FRAME_BUTTON = AppKit.NSMakeRect(600, 40, 160, 44)
+FRAME_SECONDARY = AppKit.NSMakeRect(420, 40, 160, 44)
+IMAGE_SHADOW_OFFSET = AppKit.NSMakeSize(0, -2)
+
+# guide.mp4 is 1728x1080; it fills the window's height and is centered, cropping the sides.
+# Update these if the video is ever re-exported at another size.
+GUIDE_VIDEO_WIDTH = 1728
+GUIDE_VIDEO_HEIGHT = 1080
+_video_width = GUIDE_VIDEO_WIDTH * 600 / GUIDE_VIDEO_HEIGHT
+FRAME_VIDEO = AppKit.NSMakeRect(-(_video_width - 800) / 2, 0, _video_width, 600)
+
+# Dynamic Island title over the guide, centered at the top of the window
+ISLAND_WIDTH = 450
+ISLAND_HEIGHT = 40
+FRAME_ISLAND = AppKit.NSMakeRect((800 - ISLAND_WIDTH) / 2, 600 - ISLAND_HEIGHT, ISLAND_WIDTH, ISLAND_HEIGHT)
+FRAME_ISLAND_TITLE = AppKit.NSMakeRect(0, 5, ISLAND_WIDTH, 30)
+
+# Thread that writes queued log records to LOG_FILE, see start_file_logging()
+_log_listener = None
+_log_buffer = None
+_log_terminate_observer = None
+
+# Records held in memory before they're written out, warnings go out at once
+LOG_BUFFER_CAPACITY = 200
+
+def start_file_logging():
+    """Log to LOG_FILE from a background thread so the UI never waits on disk"""
+    global _log_listener, _log_buffer, _log_terminate_observer
+    root = logging.getLogger()
+    if root.handlers:
+        return  # already configured (e.g. by the menu-bar app), like basicConfig
+    os.makedirs(LOG_DIR, exist_ok=True)
+    file_handler = logging.FileHandler(LOG_FILE)
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    # Batch the INFO chatter into fewer writes
+    _log_buffer = MemoryHandler(LOG_BUFFER_CAPACITY, flushLevel=logging.WARNING, target=file_handler)
+    log_queue = queue.Queue(-1)
+    _log_listener = QueueListener(log_queue, _log_buffer)
+    _log_listener.start()
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+    # In case the wizard goes away without reaching stop_file_logging()
+    atexit.register(stop_file_logging)
+    # Quit from the menu or the Dock goes straight to NSApp.terminate:, and
+    # Cocoa's exit() skips atexit, so flush when the app is about to terminate
+    _log_terminate_observer = AppKit.NSNotificationCenter.defaultCenter().addObserverForName_object_queue_usingBlock_(
+        AppKit.NSApplicationWillTerminateNotification,
+        None,
+        None,
+        lambda notification: stop_file_logging()
+    )
+
+def stop_file_logging():
+    """Write out anything still queued, call before the process exits"""
+    global _log_listener, _log_buffer, _log_terminate_observer
+    if _log_terminate_observer is not None:
+        AppKit.NSNotificationCenter.defaultCenter().removeObserver_(_log_terminate_observer)
+        _log_terminate_observer = None
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+    if _log_buffer is not None:
+        _log_buffer.flush()
+        _log_buffer = None
 
 class WindowDelegate(AppKit.NSObject):
     def windowShouldClose_(self, sender):
-        alert = AppKit.NSAlert.alloc().init()
-        alert.setMessageText_("Quit Setup?")
-        alert.setInformativeText_("Are you sure you want to quit the setup?")
-        alert.addButtonWithTitle_("Quit")
-        alert.addButtonWithTitle_("Cancel")
+        # Built on the first close attempt and kept in case the user cancels and tries again
+        alert = getattr(self, '_quit_alert', None)
+        if alert is None:
+            alert = AppKit.NSAlert.alloc().init()
+            alert.setMessageText_("Quit Setup?")
+            alert.setInformativeText_("Are you sure you want to quit the setup?")
+            alert.addButtonWithTitle_("Quit")
+            alert.addButtonWithTitle_("Cancel")
+            self._quit_alert = alert
         
         if alert.runModal() == AppKit.NSAlertFirstButtonReturn:
+            stop_file_logging()
             AppKit.NSApp.terminate_(None)
             return True
         return False
 
 class SetupWizard:
+    # Wizard pages. Steps with a "done_flag" swap in the "_done" text/button
+    # once that attribute is true, so the same templates serve every instance.
+    STEPS = (
+        {
+            "title": "Welcome to SoundGrabber!",
+            "text": "Let's set up your audio recording environment. This will take about 2 minutes.",
+            "image": "welcome.png",
+            "button": "Start Setup"
+        },
+        {
+            "title": "Step 1: Install BlackHole",
+            "text": """First, we'll install BlackHole, which allows SoundGrabber to capture system audio.
+
+When the installer appears, follow the prompts and enter your password when asked.""",
+            "text_done": "BlackHole is already installed!",
+            "image": "blackhole_install.png",
+            "button": "Install BlackHole",
+            "button_done": "Continue",
+            "done_flag": "blackhole_installed"
+        },
+        {
+            "title": "Step 2: Create Multi-Output Device",
+            "text": """Click 'Open Audio Setup', then set up your audio output:
+
+1. Click '+' in bottom left and select 'Create Multi-Output Device'
+2. Double click the title of 'Multi-Output Device' (left panel)
+3. Rename it to 'SoundGrabber'
+4. Tick 'Use' for both BlackHole 2ch and your speakers
+5. Close Audio MIDI Setup (Cmd+Q) and press 'Continue'""",
+            "image": "audio_midi_setup.png",
+            "button": "Open Audio Setup",
+            "button_done": "Continue",
+            "done_flag": "soundgrabber_device_setup"
+        },
+        {
+            "title": "Setup Complete!",
+            "text": "SoundGrabber is now ready to use. Would you like to watch a quick guide on how to use it?",
+            "image": "complete.png",
+            "button": "Watch Guide",
+            "secondary_button": "Skip Guide"  # Add secondary button
+        },
+        {
+            "title": "Quick Start Guide",
+            "text": "Watch this short guide to learn how to use SoundGrabber",
+            "video": True,
+            "button": "Finish"
+        }
+    )
+    _n_steps = len(STEPS)
+
+    # White semibold title shared by both buttons
+    BUTTON_TITLE_ATTRS = {
+        AppKit.NSFontAttributeName: AppKit.NSFont.systemFontOfSize_weight_(13, AppKit.NSFontWeightSemibold),
+        AppKit.NSForegroundColorAttributeName: AppKit.NSColor.whiteColor()
+    }
+
+    # Dynamic Island mask for the guide title, built on first use by setup_video_player
+    _ISLAND_PATH = None
+
     def __init__(self):
         try:
             # Set up logging in user's home directory
-            home_dir = os.path.expanduser('~')
-            log_dir = os.path.join(home_dir, '.soundgrabber')
-            if not os.path.exists(log_dir):
-                os.makedirs(log_dir)
-            log_file = os.path.join(log_dir, 'setup_wizard.log')
-            logging.basicConfig(
-                filename=log_file,
-                level=logging.INFO,
-                format='%(asctime)s - %(levelname)s - %(message)s'
-            )
-            logging.info("=== Setup Wizard Log Started ===")
-            logging.info(f"Log file location: {log_file}")
-            logging.info("Starting Setup Wizard...")
+            start_file_logging()
+            logger.info("=== Setup Wizard Log Started ===")
+            logger.info("Log file location: %s", LOG_FILE)
+            logger.info("Starting Setup Wizard...")
 
             # Define video frame dimensions
             self.video_frame = AppKit.NSMakeRect(40, 100, 720, 405)  # x, y, width, height
             
-            # Update resource paths
-            self.background_image = resource_path('resources/setup/background.png')
-            self.welcome_image = resource_path('resources/setup/welcome.png')
-            self.blackhole_install_image = resource_path('resources/setup/blackhole_install.png')
-            self.audio_midi_setup_image = resource_path('resources/setup/audio_midi_setup.png')
-            self.complete_image = resource_path('resources/setup/complete.png')
-            self.guide_video = resource_path('resources/setup/guide.mp4')
+            # Step images are loaded by name through _step_image(), the video from GUIDE_VIDEO
             
             # Store path to SwitchAudioSource
-            self.switch_audio_source_path = resource_path('resources/SwitchAudioSource')
+            self.switch_audio_source_path = SWITCH_AUDIO_SOURCE
+            self._switch_available = SWITCH_AUDIO_SOURCE_EXISTS and os.access(SWITCH_AUDIO_SOURCE, os.X_OK)
+            if not audio_devices.AVAILABLE and not self._switch_available:
+                logger.error("CoreAudio unavailable and SwitchAudioSource not usable at: %s", SWITCH_AUDIO_SOURCE)
             
             # Store path to BlackHole installer
-            self.blackhole_installer = resource_path('installers/BlackHole2ch-0.6.0.pkg')
+            self.blackhole_installer = BLACKHOLE_INSTALLER
+            if not BLACKHOLE_INSTALLER_EXISTS:
+                logger.warning("BlackHole installer not found at: %s", self.blackhole_installer)
+            
+            # Positive results of the device checks are remembered; installs only
+            # ever add devices, so a True answer stays valid for the session
+            self._bh_cache = None
+            self._mod_cache = None
+            # (timestamp, frozenset of device names) from the last SwitchAudioSource run
+            self._dev_cache = (0.0, None)
+            self._dev_lock = threading.Lock()
+            
+            # Timer that polls for BlackHole while its installer is open
+            self._poll_timer = None
+            self._poll_ticks = 0
+            self._poll_waited = 0.0
+            self._polling = False
+            
+            # Device checks can block (CoreAudio or SwitchAudioSource), so they run here instead of on the main thread
+            self.worker_queue = AppKit.NSOperationQueue.alloc().init()
+            
+            # Resolved on first use by audio_midi_setup_url()
+            self._audio_midi_setup_url = None
+            
+            # Whether we sent the user off to change a device this run; if not,
+            # the flags from startup are still good and need no re-check
+            self._blackhole_touched = False
+            self._multioutput_touched = False
+            
+            # Step images by file name, filled by _step_image()
+            self._image_cache = {}
+            
+            # One alert reused for every error the wizard shows
+            self._alert = AppKit.NSAlert.alloc().init()
+            self._alert.addButtonWithTitle_("OK")
+            
+            # Guide video item and its end-of-playback observer token
+            self._video_item = None
+            self._end_token = None
+            
+            # CoreAudio device-change listener, registered once the window is going to be built
+            self._devices_listener = None
             
             # Initialize status flags AFTER switch_audio_source_path is set
             self.blackhole_installed = self.check_blackhole_installed()
@@ -70,60 +258,38 @@ class SetupWizard:
             app = AppKit.NSApplication.sharedApplication()
             app.setActivationPolicy_(AppKit.NSApplicationActivationPolicyRegular)
             
+            self._activity = None
+            
+            # Everything is already in place, no window to build
+            self.already_done = self.blackhole_installed and self.soundgrabber_device_setup
+            if self.already_done:
+                logger.info("BlackHole and SoundGrabber device already set up, skipping wizard window")
+                return
+            
+            # Keep App Nap from throttling the poll timer and device checks while
+            # the installer or Audio MIDI Setup is in front
+            self._activity = Foundation.NSProcessInfo.processInfo().beginActivityWithOptions_reason_(
+                Foundation.NSActivityUserInitiated | Foundation.NSActivityLatencyCritical,
+                "SoundGrabber setup wizard"
+            )
+            
+            # Let CoreAudio tell us when devices come and go instead of only polling
+            if audio_devices.AVAILABLE:
+                try:
+                    self._devices_listener = audio_devices.add_devices_listener(self._devices_changed)
+                except OSError as e:
+                    logger.warning("Could not watch for device changes: %s", e)
+            
             # Set the dock icon
-            icon_path = resource_path("resources/icon.icns")
-            if os.path.exists(icon_path):
-                icon = AppKit.NSImage.alloc().initWithContentsOfFile_(icon_path)
+            if os.path.exists(ICON_PATH):
+                icon = AppKit.NSImage.alloc().initWithContentsOfFile_(ICON_PATH)
                 app.setApplicationIconImage_(icon)
             else:
-                logging.error(f"Icon not found at path: {icon_path}")
+                logger.error("Icon not found at path: %s", ICON_PATH)
             
             # Initialize the rest of the wizard
             self.current_step = 0
             
-            # Modify steps to be dynamic based on what's already installed
-            self.steps = [
-                {
-                    "title": "Welcome to SoundGrabber!",
-                    "text": "Let's set up your audio recording environment. This will take about 2 minutes.",
-                    "image": "welcome.png",
-                    "button": "Start Setup"
-                },
-                {
-                    "title": "Step 1: Install BlackHole",
-                    "text": """First, we'll install BlackHole, which allows SoundGrabber to capture system audio.
-
-When the installer appears, follow the prompts and enter your password when asked.""" if not self.blackhole_installed else "BlackHole is already installed!",
-                    "image": "blackhole_install.png",
-                    "button": "Continue" if self.blackhole_installed else "Install BlackHole"
-                },
-                {
-                    "title": "Step 2: Create Multi-Output Device",
-                    "text": """Click 'Open Audio Setup', then set up your audio output:
-
-1. Click '+' in bottom left and select 'Create Multi-Output Device'
-2. Double click the title of 'Multi-Output Device' (left panel)
-3. Rename it to 'SoundGrabber'
-4. Tick 'Use' for both BlackHole 2ch and your speakers
-5. Close Audio MIDI Setup (Cmd+Q) and press 'Continue'""",
-                    "image": "audio_midi_setup.png",
-                    "button": "Open Audio Setup" if not self.soundgrabber_device_setup else "Continue"
-                },
-                {
-                    "title": "Setup Complete!",
-                    "text": "SoundGrabber is now ready to use. Would you like to watch a quick guide on how to use it?",
-                    "image": "complete.png",
-                    "button": "Watch Guide",
-                    "secondary_button": "Skip Guide"  # Add secondary button
-                },
-                {
-                    "title": "Quick Start Guide",
-                    "text": "Watch this short guide to learn how to use SoundGrabber",
-                    "video": True,
-                    "button": "Finish"
-                }
-            ]
-            
             # Add Quit menu item
             menubar = AppKit.NSMenu.alloc().init()
             app_menu_item = AppKit.NSMenuItem.alloc().init()
@@ -139,81 +305,160 @@ When the installer appears, follow the prompts and enter your password when aske
             
             app.setMainMenu_(menubar)
             
-            logging.info("Setup wizard initialized, creating window...")
+            logger.info("Setup wizard initialized, creating window...")
             self.setup_window()
-            logging.info("Setup wizard window created successfully")
+            logger.info("Setup wizard window created successfully")
             
             # Add delegate to handle window close button
             self.delegate = WindowDelegate.alloc().init()
             self.window.setDelegate_(self.delegate)
             
         except Exception as e:
-            logging.error(f"Failed to initialize setup wizard: {e}")
-            logging.error(traceback.format_exc())
+            logger.exception("Failed to initialize setup wizard: %s", e)
             raise
         
+    def invalidate_checks(self):
+        """Forget remembered check results so the next check probes again"""
+        self._bh_cache = None
+        self._mod_cache = None
+        self._invalidate_devices()
+
+    def _invalidate_devices(self):
+        """Make the next device check take a fresh listing"""
+        self._dev_cache = (0.0, None)
+
+    def _list_audio_devices(self):
+        """Return the set of audio device names, reusing a listing younger than DEVICE_CACHE_TTL seconds"""
+        # Checks running at the same time on the worker queue wait here and
+        # reuse the listing the first one takes instead of forking their own
+        with self._dev_lock:
+            stamp, devices = self._dev_cache
+            if devices is not None and time.monotonic() - stamp < DEVICE_CACHE_TTL:
+                return devices
+            
+            if audio_devices.AVAILABLE:
+                # Ask CoreAudio directly, no process to spawn
+                devices = audio_devices.list_device_names()
+            elif not self._switch_available:
+                # Nothing to ask, treat it as no devices rather than raising on every check
+                devices = frozenset()
+            else:
+                # Bounded so a stuck SwitchAudioSource can't hold up the worker queue
+                result = subprocess.run([self.switch_audio_source_path, '-a'],
+                                      capture_output=True, timeout=3)
+                # Decode the whole listing once as UTF-8 rather than through the locale
+                output = result.stdout.decode('utf-8', 'replace')
+                devices = frozenset(line.strip() for line in output.splitlines())
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Available audio devices:\n" + "\n".join(sorted(devices)))
+            self._dev_cache = (time.monotonic(), devices)
+            return devices
+
+    def _devices_changed(self):
+        # Called by CoreAudio, possibly off the main thread
+        self._invalidate_devices()
+        AppKit.NSOperationQueue.mainQueue().addOperationWithBlock_(self.on_devices_changed)
+
+    def on_devices_changed(self):
+        if not hasattr(self, 'button'):
+            return  # window not built (yet)
+        if self._polling and self._poll_timer is not None:
+            # Waiting on the installer, check now instead of at the next scheduled poll
+            self._poll_timer.invalidate()
+            self.pollInstall_(None)
+        elif self.current_step == 1 and not self.blackhole_installed:
+            # Polling gave up or never started, but the installer can still finish
+            self._async_check(self.check_blackhole_installed, self.on_blackhole_appeared)
+        elif self.current_step == 2 and not self.soundgrabber_device_setup:
+            self._async_check(self.check_multi_output_device, self.on_device_list_changed)
+
+    def on_blackhole_appeared(self, found):
+        if found and self.current_step == 1 and not self._polling:
+            self.blackhole_installed = True
+            self.update_content()
+
+    def on_device_list_changed(self, found):
+        if found and self.current_step == 2:
+            self.soundgrabber_device_setup = True
+            self.update_content()
+
+    def end_activity(self):
+        if self._activity is not None:
+            Foundation.NSProcessInfo.processInfo().endActivity_(self._activity)
+            self._activity = None
+
+    def stop_device_listener(self):
+        if self._devices_listener is not None:
+            audio_devices.remove_devices_listener(self._devices_listener)
+            self._devices_listener = None
+
+    def _check_all(self):
+        """Return (blackhole_installed, multi_output_ready) from a single fresh device listing"""
+        self._invalidate_devices()
+        devices = self._list_audio_devices()
+        checks = (audio_devices.has_device(devices, 'BlackHole 2ch'),
+                  audio_devices.has_device(devices, 'SoundGrabber'))
+        logger.info("Final device check: BlackHole=%s, SoundGrabber=%s", *checks)
+        return checks
+
     def check_blackhole_installed(self):
+        if self._bh_cache:
+            return True
         try:
-            # First try using switchaudio-source to list devices
-            result = subprocess.run([self.switch_audio_source_path, '-a'], 
-                                  capture_output=True, text=True)
+            devices = self._list_audio_devices()
             
-            if 'BlackHole 2ch' in result.stdout:
-                logging.info("BlackHole 2ch found in audio devices list")
+            if audio_devices.has_device(devices, 'BlackHole 2ch'):
+                logger.info("BlackHole 2ch found in audio devices list")
+                self._bh_cache = True
                 return True
             
-            logging.info("BlackHole 2ch device not found")
+            logger.info("BlackHole 2ch device not found")
             return False
         except Exception as e:
-            logging.error(f"Error checking BlackHole: {e}")
-            logging.error(traceback.format_exc())
+            logger.exception("Error checking BlackHole: %s", e)
             return False
 
     def check_multi_output_device(self):
+        if self._mod_cache:
+            return True
         try:
-            # Check if SoundGrabber exists
-            result = subprocess.run([self.switch_audio_source_path, '-a'], 
-                                 capture_output=True, text=True)
-            
-            logging.info(f"Available audio devices:\n{result.stdout}")
-            
-            # Exact match check for "SoundGrabber"
-            if "SoundGrabber" not in result.stdout.split('\n'):
-                logging.info("SoundGrabber device not found in audio devices list")
+            # Same substring match as needs_setup() so the two never disagree
+            if not audio_devices.has_device(self._list_audio_devices(), 'SoundGrabber'):
+                logger.info("SoundGrabber device not found in audio devices list")
                 return False
             
-            logging.info("Found SoundGrabber device")
+            logger.info("Found SoundGrabber device")
+            self._mod_cache = True
             return True
                 
         except Exception as e:
-            logging.error(f"Error checking Multi-Output device: {e}")
-            logging.error(traceback.format_exc())
+            logger.exception("Error checking Multi-Output device: %s", e)
             return False
 
-    def verify_step(self):
-        if self.current_step == 1:  # BlackHole
-            if not self.check_blackhole_installed():
-                self.show_error("BlackHole Installation", 
-                              "BlackHole doesn't appear to be installed yet. Please complete the installation.")
-                return False
-        elif self.current_step == 2:  # Multi-Output Device
-            if not self.check_multi_output_device():
-                self.show_error("Audio Setup", 
-                              "The 'SoundGrabber' Multi-Output Device hasn't been created yet. Please complete the setup.")
-                return False
-        return True
+    def show_error(self, title, message, completion=None):
+        """Show the wizard's shared alert as a sheet on the window"""
+        self._alert.setMessageText_(title)
+        self._alert.setInformativeText_(message)
+        if self._alert.window().isVisible():
+            return  # already showing, the new text is enough
+        # Sheet instead of runModal so the run loop (and polling) keeps going
+        self._alert.beginSheetModalForWindow_completionHandler_(self.window, completion)
 
-    def show_error(self, title, message):
-        alert = AppKit.NSAlert.alloc().init()
-        alert.setMessageText_(title)
-        alert.setInformativeText_(message)
-        alert.addButtonWithTitle_("OK")
-        alert.runModal()
+    def _async_check(self, fn, callback):
+        """Run a blocking check on the worker queue and pass its result to callback on the main thread"""
+        def work():
+            try:
+                result = fn()
+            except Exception:
+                logger.exception("Device check failed")
+                result = False
+            AppKit.NSOperationQueue.mainQueue().addOperationWithBlock_(lambda: callback(result))
+        self.worker_queue.addOperationWithBlock_(work)
         
     def setup_window(self):
         # Create window with larger dimensions and rounded corners
         self.window = AppKit.NSWindow.alloc().initWithContentRect_styleMask_backing_defer_(
-            AppKit.NSMakeRect(0, 0, 800, 600),
+            FRAME_WINDOW,
             AppKit.NSWindowStyleMaskTitled | 
             AppKit.NSWindowStyleMaskClosable | 
             AppKit.NSWindowStyleMaskMiniaturizable |
@@ -227,25 +472,20 @@ When the installer appears, follow the prompts and enter your password when aske
         self.window.setTitlebarAppearsTransparent_(True)
         
         # Create content view
-        self.content = AppKit.NSView.alloc().initWithFrame_(
-            AppKit.NSMakeRect(0, 0, 800, 600)
-        )
+        self.content = AppKit.NSView.alloc().initWithFrame_(FRAME_WINDOW)
         self.content.setWantsLayer_(True)
         
-        # Add background image first
-        background_image_path = resource_path(os.path.join("resources", "setup", "background.png"))
-        if os.path.exists(background_image_path):
-            background_image = AppKit.NSImage.alloc().initWithContentsOfFile_(background_image_path)
-            background_imageview = AppKit.NSImageView.alloc().initWithFrame_(
-                AppKit.NSMakeRect(0, 0, 800, 600)
-            )
-            background_imageview.setImage_(background_image)
-            background_imageview.setImageScaling_(AppKit.NSImageScaleAxesIndependently)
-            self.content.addSubview_(background_imageview)
+        # All the layer styling below goes out in one commit, without implicit animations
+        AppKit.CATransaction.begin()
+        AppKit.CATransaction.setDisableActions_(True)
+        
+        # Background goes straight on the content view's layer, no extra view to draw or hit-test
+        self.content.layer().setContentsGravity_(AppKit.kCAGravityResize)
+        self.content.layer().setContents_(self._step_image("background.png"))
         
         # Create title label with original position
         self.title_label = AppKit.NSTextField.alloc().initWithFrame_(
-            AppKit.NSMakeRect(40, 520, 720, 40)  # Back to original height
+            FRAME_TITLE  # Back to original height
         )
         self.title_label.setBezeled_(False)
         self.title_label.setDrawsBackground_(False)
@@ -254,19 +494,18 @@ When the installer appears, follow the prompts and enter your password when aske
         self.title_label.setTextColor_(AppKit.NSColor.blackColor())  # Dark text
         
         # Add image view with shadow
-        self.image_view = AppKit.NSImageView.alloc().initWithFrame_(
-            AppKit.NSMakeRect(40, 180, 720, 320)
-        )
+        self.image_view = AppKit.NSImageView.alloc().initWithFrame_(FRAME_IMAGE)
         self.image_view.setWantsLayer_(True)
-        self.image_view.layer().setCornerRadius_(8.0)  # Rounded corners for image
-        self.image_view.layer().setShadowColor_(AppKit.NSColor.blackColor().CGColor())
-        self.image_view.layer().setShadowOffset_(AppKit.NSMakeSize(0, -2))
-        self.image_view.layer().setShadowOpacity_(0.2)
-        self.image_view.layer().setShadowRadius_(10.0)
+        image_layer = self.image_view.layer()
+        image_layer.setCornerRadius_(8.0)  # Rounded corners for image
+        image_layer.setShadowColor_(AppKit.NSColor.blackColor().CGColor())
+        image_layer.setShadowOffset_(IMAGE_SHADOW_OFFSET)
+        image_layer.setShadowOpacity_(0.2)
+        image_layer.setShadowRadius_(10.0)
         
         # Add text view with lower position
         self.text_view = AppKit.NSTextField.alloc().initWithFrame_(
-            AppKit.NSMakeRect(40, 20, 520, 140)  # Keep at lower position
+            FRAME_TEXT  # Keep at lower position
         )
         self.text_view.setBezeled_(False)
         self.text_view.setDrawsBackground_(False)
@@ -287,7 +526,7 @@ When the installer appears, follow the prompts and enter your password when aske
         
         # Create button with system default styling (make sure it's on top)
         self.button = AppKit.NSButton.alloc().initWithFrame_(
-            AppKit.NSMakeRect(600, 40, 160, 44)  # Keep button position consistent
+            FRAME_BUTTON  # Keep button position consistent
         )
         
         # Use system default style
@@ -322,21 +561,14 @@ When the installer appears, follow the prompts and enter your password when aske
         button_cell.setBackgroundStyle_(0)
         
         # White text
-        attrs = {
-            AppKit.NSFontAttributeName: AppKit.NSFont.systemFontOfSize_weight_(13, AppKit.NSFontWeightSemibold),
-            AppKit.NSForegroundColorAttributeName: AppKit.NSColor.whiteColor()
-        }
-        title_string = AppKit.NSAttributedString.alloc().initWithString_attributes_("Start Setup", attrs)
+        title_string = AppKit.NSAttributedString.alloc().initWithString_attributes_(
+            "Start Setup", self.BUTTON_TITLE_ATTRS
+        )
         self.button.setAttributedTitle_(title_string)
         
-        # Debug: Print actual frame and cell size
-        actual_frame = self.button.frame()
-        logging.info(f"Button frame: {actual_frame}")
-        logging.info(f"Button cell size: {button_cell.controlSize()}")
-        
         # Add secondary button (initially hidden)
         self.secondary_button = AppKit.NSButton.alloc().initWithFrame_(
-            AppKit.NSMakeRect(420, 40, 160, 44)  # Keep original frame height
+            FRAME_SECONDARY  # Keep original frame height
         )
         self.secondary_button.setBezelStyle_(0)
         self.secondary_button.setButtonType_(AppKit.NSButtonTypeMomentaryPushIn)
@@ -355,11 +587,9 @@ When the installer appears, follow the prompts and enter your password when aske
         self.secondary_button.setBezelColor_(AppKit.NSColor.darkGrayColor())
         
         # White text for secondary button
-        attrs = {
-            AppKit.NSFontAttributeName: AppKit.NSFont.systemFontOfSize_weight_(13, AppKit.NSFontWeightSemibold),
-            AppKit.NSForegroundColorAttributeName: AppKit.NSColor.whiteColor()
-        }
-        title_string = AppKit.NSAttributedString.alloc().initWithString_attributes_("Skip Guide", attrs)
+        title_string = AppKit.NSAttributedString.alloc().initWithString_attributes_(
+            "Skip Guide", self.BUTTON_TITLE_ATTRS
+        )
         self.secondary_button.setAttributedTitle_(title_string)
         
         # Add views in correct order
@@ -368,12 +598,44 @@ When the installer appears, follow the prompts and enter your password when aske
         self.content.addSubview_(self.image_view)
         self.content.addSubview_(self.text_view)
         self.content.addSubview_(self.secondary_button)
+        AppKit.CATransaction.commit()
         
         self.window.setContentView_(self.content)
         self.update_content()
         
+        # Load the other step images in the background so Next doesn't wait on disk
+        threading.Thread(target=self._prewarm_images, daemon=True).start()
+        
+    def _build_step(self, i):
+        """Render step i from its template using the current setup state"""
+        template = self.STEPS[i]
+        if not getattr(self, template.get("done_flag", ""), False):
+            return template
+        step = dict(template)
+        step["text"] = template.get("text_done", template["text"])
+        step["button"] = template.get("button_done", template["button"])
+        return step
+
+    def _step_image(self, name):
+        """Return the NSImage for a step image, reading it from disk only once"""
+        if name not in self._image_cache:
+            image_path = os.path.join(SETUP_RES_DIR, name)
+            image = AppKit.NSImage.alloc().initWithContentsOfFile_(image_path)
+            if image is None:
+                logger.warning("Step image not found at path: %s", image_path)
+            self._image_cache[name] = image
+        return self._image_cache[name]
+
+    def _prewarm_images(self):
+        for step in self.STEPS:
+            if "image" in step:
+                image = self._step_image(step["image"])
+                if image is not None:
+                    # NSImage decodes lazily on first draw, force it here instead
+                    image.CGImageForProposedRect_context_hints_(None, None, None)
+
     def update_content(self):
-        step = self.steps[self.current_step]
+        step = self._build_step(self.current_step)
         
         # Show/hide secondary button based on current step
         if hasattr(self, 'secondary_button'):
@@ -381,8 +643,13 @@ When the installer appears, follow the prompts and enter your password when aske
         
         # If it's the video step
         if step.get("video", False):
+            # The video covers the whole window, let go of what's underneath it
+            self.content.layer().setContents_(None)
             if hasattr(self, 'image_view'):
+                self.image_view.setImage_(None)
                 self.image_view.removeFromSuperview()
+            # The cache holds the decoded bitmaps, _step_image() reloads them if a regular step comes back
+            self._image_cache.clear()
             
             if not hasattr(self, 'player_view'):
                 player = self.setup_video_player()
@@ -394,10 +661,14 @@ When the installer appears, follow the prompts and enter your password when aske
         else:
             # Regular step behavior
             if hasattr(self, 'player_view'):
+                self.remove_video_observers()
                 self.player_view.removeFromSuperview()
                 if hasattr(self, 'title_background'):
                     self.title_background.removeFromSuperview()
             
+            if self.content.layer().contents() is None:
+                self.content.layer().setContents_(self._step_image("background.png"))
+            
             self.title_label.setHidden_(False)
             self.title_label.setStringValue_(step["title"])
             self.button.setTitle_(step["button"])
@@ -406,86 +677,181 @@ When the installer appears, follow the prompts and enter your password when aske
             self.text_view.setHidden_(False)
             self.text_view.setStringValue_(step["text"])
             
-            image_path = resource_path(os.path.join("resources", "setup", step["image"]))
-            if os.path.exists(image_path):
-                image = AppKit.NSImage.alloc().initWithContentsOfFile_(image_path)
-                self.image_view.setImage_(image)
-            else:
-                self.image_view.setImage_(None)
+            self.image_view.setImage_(self._step_image(step["image"]))
         
     def nextStep_(self, sender):
+        # A click usually follows something the user did outside the wizard, start from a fresh listing
+        self._invalidate_devices()
         if self.current_step == 1:  # BlackHole installation
             if not self.blackhole_installed:
-                self.install_blackhole()
-                time.sleep(5)
+                # The installer may have finished after polling gave up, check before opening it (again)
+                self.button.setEnabled_(False)
+                self._async_check(self.check_blackhole_installed, self.on_blackhole_checked)
+                return
         
         elif self.current_step == 2:  # Multi-Output setup
             if sender.title() == "Open Audio Setup":
                 self.setup_audio()
+                self._invalidate_devices()
                 sender.setTitle_("Continue")
                 return
+            elif self.soundgrabber_device_setup and not self._multioutput_touched:
+                # Already there at startup and the user hasn't been in Audio MIDI Setup since
+                self.on_multi_output_checked(True)
+                return
             else:  # Button says "Continue"
-                if not self.check_multi_output_device():
-                    self.show_error_and_reopen_audio_setup(
-                        "Audio Setup Incomplete", 
-                        """Please ensure:
+                self.button.setEnabled_(False)
+                self._async_check(self.check_multi_output_device, self.on_multi_output_checked)
+                return
+        
+        self.advance_step()
+
+    def on_blackhole_checked(self, found):
+        self.button.setEnabled_(True)
+        if found:
+            self.blackhole_installed = True
+            self.advance_step()
+            return
+        
+        try:
+            self.install_blackhole()
+        except Exception:
+            self.show_error("BlackHole Installation", "The BlackHole installer could not be opened.")
+            return
+        self.invalidate_checks()
+        self.start_install_polling()
+
+    def on_multi_output_checked(self, found):
+        self.button.setEnabled_(True)
+        if not found:
+            self.show_error_and_reopen_audio_setup(
+                "Audio Setup Incomplete", 
+                """Please ensure:
 
 1. A Multi-Output Device named exactly 'SoundGrabber' exists
 2. Both BlackHole 2ch and your speakers are checked
 3. BlackHole 2ch is enabled (checked) in the device
 
 Need help? Check the image above for reference."""
-                    )
-                    return
-                else:
-                    # Success - animate window back to center at top of screen
-                    screen = AppKit.NSScreen.mainScreen()
-                    screen_frame = screen.visibleFrame()
-                    window_frame = self.window.frame()
-                    
-                    # Calculate center position at top of screen
-                    center_x = screen_frame.origin.x + (screen_frame.size.width - window_frame.size.width) / 2
-                    center_y = screen_frame.origin.y + screen_frame.size.height - window_frame.size.height - 20  # 20px from top
-                    
-                    # Animate to center
-                    self.window.setFrame_display_animate_(
-                        AppKit.NSMakeRect(center_x, center_y, window_frame.size.width, window_frame.size.height),
-                        True, True
-                    )
+            )
+            return
+        
+        # Success - animate window back to center at top of screen
+        screen = AppKit.NSScreen.mainScreen()
+        screen_frame = screen.visibleFrame()
+        window_frame = self.window.frame()
         
+        # Calculate center position at top of screen
+        center_x = screen_frame.origin.x + (screen_frame.size.width - window_frame.size.width) / 2
+        center_y = screen_frame.origin.y + screen_frame.size.height - window_frame.size.height - 20  # 20px from top
+        
+        # Animate to center
+        self.window.setFrame_display_animate_(
+            AppKit.NSMakeRect(center_x, center_y, window_frame.size.width, window_frame.size.height),
+            True, True
+        )
+        self.advance_step()
+
+    def advance_step(self):
         self.current_step += 1
-        if self.current_step < len(self.steps):
+        if self.current_step < self._n_steps:
             self.update_content()
         else:
-            # Final verification
-            blackhole_check = self.check_blackhole_installed()
-            multioutput_check = self.check_multi_output_device()
-            
-            if blackhole_check and multioutput_check:
-                self.window.close()
-                AppKit.NSApp.terminate_(None)
-            else:
-                self.show_error("Setup Incomplete", 
-                              "Some components are not properly installed. Please complete all steps.")
-                self.current_step -= 1
-                self.update_content()
+            # Final verification, only if something could have changed since startup
+            if (self.blackhole_installed and self.soundgrabber_device_setup
+                    and not (self._blackhole_touched or self._multioutput_touched)):
+                self.on_final_check((True, True))
+                return
+            self.button.setEnabled_(False)
+            self._async_check(self._check_all, self.on_final_check)
+
+    def on_final_check(self, checks):
+        self.button.setEnabled_(True)
+        # checks is (blackhole, multi_output), or False if the check itself failed
+        if checks and all(checks):
+            self.stop_device_listener()
+            self.end_activity()
+            self.window.close()
+            stop_file_logging()
+            AppKit.NSApp.terminate_(None)
+        else:
+            self.show_error("Setup Incomplete", 
+                          "Some components are not properly installed. Please complete all steps.")
+            self.current_step -= 1
+            self.update_content()
+
+    def start_install_polling(self):
+        """Poll for BlackHole while the installer runs instead of blocking the UI"""
+        self.stop_install_polling()
+        self._poll_ticks = 0
+        self._poll_waited = 0.0
+        self._polling = True
+        self.button.setEnabled_(False)
+        self._schedule_next_poll()
+
+    def _schedule_next_poll(self):
+        # 0.5s, 1s, 2s, 4s, then every 8s: quick installs are caught almost at
+        # once, and the device listener covers the gaps in the slow ones
+        delay = min(POLL_FIRST_DELAY * 2 ** self._poll_ticks, POLL_MAX_DELAY)
+        self._poll_waited += delay
+        self._poll_timer = AppKit.NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
+            delay, self, "pollInstall:", None, False
+        )
+
+    def stop_install_polling(self):
+        self._polling = False
+        if self._poll_timer is not None:
+            self._poll_timer.invalidate()
+            self._poll_timer = None
+        self.button.setEnabled_(True)
+
+    def pollInstall_(self, timer):
+        self._poll_timer = None
+        self._poll_ticks += 1
+        self._invalidate_devices()
+        self._async_check(self.check_blackhole_installed, self.on_install_polled)
+
+    def on_install_polled(self, found):
+        if not self._polling:
+            return  # polling was stopped while the check was running
+        if found:
+            logger.info("BlackHole detected after %d polls", self._poll_ticks)
+            self.stop_install_polling()
+            self.blackhole_installed = True
+            self.advance_step()
+        elif self._poll_waited >= POLL_TIMEOUT:
+            self.stop_install_polling()
+            self.show_error("BlackHole Installation", 
+                          "BlackHole doesn't appear to be installed yet. Please complete the installation.")
+        else:
+            self._schedule_next_poll()
 
     def install_blackhole(self):
+        self._blackhole_touched = True
         try:
-            logging.info(f"Installing BlackHole from: {self.blackhole_installer}")
-            if not os.path.exists(self.blackhole_installer):
-                logging.error(f"BlackHole installer not found at: {self.blackhole_installer}")
+            logger.info("Installing BlackHole from: %s", self.blackhole_installer)
+            if not BLACKHOLE_INSTALLER_EXISTS:
+                logger.error("BlackHole installer not found at: %s", self.blackhole_installer)
                 raise FileNotFoundError("BlackHole installer package not found")
             
-            subprocess.run(['open', self.blackhole_installer])
-            time.sleep(1)  # Give time for installer to open
+            # Hand the package to Installer directly, returns without waiting on /usr/bin/open
+            url = AppKit.NSURL.fileURLWithPath_(self.blackhole_installer)
+            if not AppKit.NSWorkspace.sharedWorkspace().openURL_(url):
+                raise RuntimeError("Could not open the BlackHole installer")
         except Exception as e:
-            logging.error(f"Failed to install BlackHole: {e}")
-            logging.error(traceback.format_exc())
+            logger.exception("Failed to install BlackHole: %s", e)
             raise
 
+    def audio_midi_setup_url(self):
+        """Locate Audio MIDI Setup once through Launch Services and remember it"""
+        if self._audio_midi_setup_url is None:
+            url = AppKit.NSWorkspace.sharedWorkspace().URLForApplicationWithBundleIdentifier_(AUDIO_MIDI_SETUP_ID)
+            self._audio_midi_setup_url = url or AppKit.NSURL.fileURLWithPath_(AUDIO_MIDI_SETUP_PATH)
+        return self._audio_midi_setup_url
+
     def setup_audio(self):
         """Open Audio MIDI Setup and position windows"""
+        self._multioutput_touched = True
         try:
             # First, position our setup wizard window to the left edge and top
             screen = AppKit.NSScreen.mainScreen()
@@ -505,78 +871,68 @@ Need help? Check the image above for reference."""
                 True, True
             )
             
-            # Simply open Audio MIDI Setup
-            subprocess.run(['open', '-a', 'Audio MIDI Setup'])
-            time.sleep(0.5)  # Give time for app to launch
+            # Launch (or bring forward) Audio MIDI Setup in one call, no open/osascript processes
+            url = self.audio_midi_setup_url()
+            config = AppKit.NSWorkspaceOpenConfiguration.configuration()
+            config.setActivates_(True)
             
-            script = """
-                tell application "Audio MIDI Setup"
-                    activate
-                end tell
-            """
-            subprocess.run(['osascript', '-e', script])
+            def launched(app, error):
+                if error is not None:
+                    logger.error("Failed to open Audio MIDI Setup: %s", error)
+            
+            AppKit.NSWorkspace.sharedWorkspace().openApplicationAtURL_configuration_completionHandler_(
+                url, config, launched
+            )
             
         except Exception as e:
-            logging.error(f"Failed to open Audio MIDI Setup: {e}")
-            logging.error(traceback.format_exc())
+            logger.exception("Failed to open Audio MIDI Setup: %s", e)
 
     def show(self):
         try:
-            logging.info("Showing setup wizard window...")
+            if self.already_done:
+                logger.info("Nothing to set up, not showing the setup wizard window")
+                return
+            
+            logger.info("Showing setup wizard window...")
             self.window.center()
             self.window.makeKeyAndOrderFront_(None)
             AppKit.NSApp.activateIgnoringOtherApps_(True)
-            logging.info("Setup wizard window shown successfully")
+            logger.info("Setup wizard window shown successfully")
         except Exception as e:
-            logging.error(f"Failed to show setup wizard: {e}")
-            logging.error(traceback.format_exc())
+            logger.exception("Failed to show setup wizard: %s", e)
             raise
 
     def show_error_and_reopen_audio_setup(self, title, message):
         """Shows error dialog and reopens Audio MIDI Setup"""
-        alert = AppKit.NSAlert.alloc().init()
-        alert.setMessageText_(title)
-        alert.setInformativeText_("""Please ensure:
+        # Reopen/bring to front Audio MIDI Setup once the sheet is dismissed
+        self.show_error(title, """Please ensure:
 
 1. A Multi-Output Device named exactly 'SoundGrabber' exists
 2. Both BlackHole 2ch and your preferred listening device are checked
 
-Need help? Check the image above for reference or send an email to a.ivans@icloud.com""")
-        alert.addButtonWithTitle_("OK")
-        alert.runModal()
-        
-        # Reopen/bring to front Audio MIDI Setup
-        self.setup_audio()
+Need help? Check the image above for reference or send an email to a.ivans@icloud.com""",
+                        lambda response: self.setup_audio())
 
     def close_window(self, sender):
         # Simple direct quit without confirmation
+        self.end_activity()
+        stop_file_logging()
         AppKit.NSApp.terminate_(None)
 
     def setup_video_player(self):
+        # AV frameworks are only loaded once the user actually reaches the guide
+        import AVKit
+        import AVFoundation
+        
         # Create AVPlayerView
         self.player_view = AVKit.AVPlayerView.alloc().init()
         
-        # Original video dimensions
-        original_width = 1728
-        original_height = 1080
-        
-        # Use full window height
-        available_height = 600
-        
-        # Calculate width based on aspect ratio to fill height
-        scale = available_height / original_height
-        new_width = original_width * scale
-        
-        # Calculate x offset to center the wider video
-        x_offset = (new_width - 800) / 2 * -1
-        
         # Position video to fill full height from top to bottom
-        self.player_view.setFrame_(AppKit.NSMakeRect(
-            x_offset,
-            0,              # Start from top
-            new_width,
-            available_height  # Use exact window height
-        ))
+        self.player_view.setFrame_(FRAME_VIDEO)
+        
+        # The guide opens on screen, style its layers in one commit without implicit animations
+        AppKit.CATransaction.begin()
+        AppKit.CATransaction.setDisableActions_(True)
         
         self.player_view.setWantsLayer_(True)
         self.player_view.setVideoGravity_(AVFoundation.AVLayerVideoGravityResizeAspectFill)
@@ -585,67 +941,55 @@ Need help? Check the image above for reference or send an email to a.ivans@iclou
         self.player_view.setShowsFullScreenToggleButton_(False)
         
         # Create background for title with Dynamic Island style
-        island_width = 450
-        island_height = 40
-        
-        self.title_background = AppKit.NSVisualEffectView.alloc().initWithFrame_(
-            AppKit.NSMakeRect(
-                (800 - island_width) / 2,  # Exact center
-                600 - island_height,       # Exactly at top
-                island_width,
-                island_height
-            )
-        )
+        island_width = ISLAND_WIDTH
+        island_height = ISLAND_HEIGHT
+        
+        self.title_background = AppKit.NSVisualEffectView.alloc().initWithFrame_(FRAME_ISLAND)
         self.title_background.setMaterial_(AppKit.NSVisualEffectMaterialUltraDark)
         self.title_background.setBlendingMode_(AppKit.NSVisualEffectBlendingModeBehindWindow)
         self.title_background.setState_(AppKit.NSVisualEffectStateActive)
         self.title_background.setWantsLayer_(True)
         
-        # Create custom shape for Dynamic Island style
-        path = AppKit.NSBezierPath.bezierPath()
+        # Create custom shape for Dynamic Island style, the same for every wizard
+        if SetupWizard._ISLAND_PATH is None:
+            path = AppKit.NSBezierPath.bezierPath()
         
-        # Different radii for top and bottom
-        bottom_radius = 20
+            # Different radii for top and bottom
+            bottom_radius = 20
         
-        # Start at top-left with sharp corner
-        path.moveToPoint_(AppKit.NSMakePoint(0, island_height))
+            # Start at top-left with sharp corner
+            path.moveToPoint_(AppKit.NSMakePoint(0, island_height))
         
-        # Top edge (straight)
-        path.lineToPoint_(AppKit.NSMakePoint(island_width, island_height))
+            # Top edge (straight)
+            path.lineToPoint_(AppKit.NSMakePoint(island_width, island_height))
         
-        # Right edge
-        path.lineToPoint_(AppKit.NSMakePoint(island_width, bottom_radius))
+            # Right edge
+            path.lineToPoint_(AppKit.NSMakePoint(island_width, bottom_radius))
         
-        # Bottom right corner
-        path.appendBezierPathWithArcFromPoint_toPoint_radius_(
-            AppKit.NSMakePoint(island_width, 0),
-            AppKit.NSMakePoint(0, 0),
-            bottom_radius
-        )
+            # Bottom right corner
+            path.appendBezierPathWithArcFromPoint_toPoint_radius_(
+                AppKit.NSMakePoint(island_width, 0),
+                AppKit.NSMakePoint(0, 0),
+                bottom_radius
+            )
         
-        # Bottom left corner
-        path.appendBezierPathWithArcFromPoint_toPoint_radius_(
-            AppKit.NSMakePoint(0, 0),
-            AppKit.NSMakePoint(0, island_height),
-            bottom_radius
-        )
+            # Bottom left corner
+            path.appendBezierPathWithArcFromPoint_toPoint_radius_(
+                AppKit.NSMakePoint(0, 0),
+                AppKit.NSMakePoint(0, island_height),
+                bottom_radius
+            )
         
-        path.closePath()
+            path.closePath()
+            SetupWizard._ISLAND_PATH = path.CGPath()
         
         # Apply the mask
         mask = AppKit.CAShapeLayer.layer()
-        mask.setPath_(path.CGPath())
+        mask.setPath_(SetupWizard._ISLAND_PATH)
         self.title_background.layer().setMask_(mask)
         
         # Create and style title label with exact centering
-        self.title = AppKit.NSTextField.alloc().initWithFrame_(
-            AppKit.NSMakeRect(
-                0,  # No left padding - will center in full width
-                5,  # Vertical centering
-                island_width, # Use full width of background
-                30  # Height
-            )
-        )
+        self.title = AppKit.NSTextField.alloc().initWithFrame_(FRAME_ISLAND_TITLE)
         self.title.setStringValue_("Quick Start Guide")
         self.title.setBezeled_(False)
         self.title.setDrawsBackground_(False)
@@ -657,31 +1001,25 @@ Need help? Check the image above for reference or send an email to a.ivans@iclou
         # Add title to background
         self.title_background.addSubview_(self.title)
         
-        # Set up video player
-        video_path = resource_path(os.path.join("resources", "setup", "guide.mp4"))
-        video_url = AppKit.NSURL.fileURLWithPath_(video_path)
-        player = AVFoundation.AVPlayer.playerWithURL_(video_url)
+        # Set up video player, the asset is loaded off the main thread and
+        # handed to the player once it's known to be playable
+        video_url = AppKit.NSURL.fileURLWithPath_(GUIDE_VIDEO)
+        player = AVFoundation.AVPlayer.alloc().init()
         self.player_view.setPlayer_(player)
+        asset = AVFoundation.AVURLAsset.URLAssetWithURL_options_(video_url, None)
         
-        # Add observer for video completion using KVO
-        self.player_view.player().currentItem().addObserver_forKeyPath_options_context_(
-            self,
-            'status',
-            AVFoundation.NSKeyValueObservingOptionNew,
-            None
-        )
+        def loaded():
+            # Called by AVFoundation on one of its own queues
+            AppKit.NSOperationQueue.mainQueue().addOperationWithBlock_(
+                lambda: self.on_video_loaded(player, asset)
+            )
         
-        # Register for end of video notification
-        AppKit.NSNotificationCenter.defaultCenter().addObserver_selector_name_object_(
-            self,
-            'videoDidFinish:',
-            AVFoundation.AVPlayerItemDidPlayToEndTimeNotification,
-            player.currentItem()
-        )
+        asset.loadValuesAsynchronouslyForKeys_completionHandler_(["playable"], loaded)
         
         # Add views in correct order
         self.content.addSubview_(self.player_view)
         self.content.addSubview_(self.title_background)
+        AppKit.CATransaction.commit()
         
         # Hide button initially
         if hasattr(self, 'button'):
@@ -689,252 +1027,99 @@ Need help? Check the image above for reference or send an email to a.ivans@iclou
         
         return player
 
-    def observeValueForKeyPath_ofObject_change_context_(self, keyPath, object, change, context):
-        if keyPath == 'status':
-            if object.status() == AVFoundation.AVPlayerItemStatusReadyToPlay:
-                # Video is ready to play
-                self.player_view.player().play()
+    def on_video_loaded(self, player, asset):
+        import AVFoundation  # already loaded by setup_video_player
+        if not self.window.isVisible():
+            return  # guide was skipped while the asset loaded
+        
+        status, error = asset.statusOfValueForKey_error_("playable", None)
+        if status != AVFoundation.AVKeyValueStatusLoaded or not asset.isPlayable():
+            logger.error("Could not load guide video: %s", error)
+            self.videoDidFinish_(None)
+            return
+        
+        # Never leave a second observer behind if the guide is set up again
+        self.remove_video_observers()
+        
+        self._video_item = AVFoundation.AVPlayerItem.playerItemWithAsset_(asset)
+        
+        # Register for end of video notification, the token lets us remove exactly this one
+        self._end_token = AppKit.NSNotificationCenter.defaultCenter().addObserverForName_object_queue_usingBlock_(
+            AVFoundation.AVPlayerItemDidPlayToEndTimeNotification,
+            self._video_item,
+            AppKit.NSOperationQueue.mainQueue(),
+            lambda notification: self.videoDidFinish_(notification)
+        )
+        
+        player.replaceCurrentItemWithPlayerItem_(self._video_item)
+        player.play()
+
+    def remove_video_observers(self):
+        if self._end_token is not None:
+            AppKit.NSNotificationCenter.defaultCenter().removeObserver_(self._end_token)
+            self._end_token = None
+        self._video_item = None
 
     def videoDidFinish_(self, notification):
-        logging.info("=== Starting App Restart Process ===")
+        logger.info("=== Starting App Restart Process ===")
         try:
             # Close current window
-            logging.info("Closing setup wizard window...")
+            self.remove_video_observers()
+            self.stop_device_listener()
+            self.end_activity()
+            logger.info("Closing setup wizard window...")
             self.window.close()
             
             # Get the bundle path using NSBundle
             bundle = AppKit.NSBundle.mainBundle()
             bundle_path = bundle.bundlePath()
-            logging.info(f"Found bundle path: {bundle_path}")
-            logging.info(f"Bundle identifier: {bundle.bundleIdentifier()}")
-            logging.info(f"Bundle executable path: {bundle.executablePath()}")
+            logger.info("Found bundle path: %s", bundle_path)
+            logger.info("Bundle identifier: %s", bundle.bundleIdentifier())
+            logger.info("Bundle executable path: %s", bundle.executablePath())
             
             if bundle_path.endswith('.app'):
                 # We're running from a bundle
-                logging.info(f"Running from bundle: {bundle_path}")
-                
-                # Create a new instance before terminating current one
-                launch_cmd = ['open', '-n', bundle_path]
-                logging.info(f"Launching new instance with command: {launch_cmd}")
-                
-                process = subprocess.Popen(launch_cmd, 
-                                        stdout=subprocess.PIPE, 
-                                        stderr=subprocess.PIPE)
+                logger.info("Running from bundle: %s", bundle_path)
                 
-                stdout, stderr = process.communicate()
-                logging.info(f"Launch process return code: {process.returncode}")
-                if stdout:
-                    logging.info(f"Launch stdout: {stdout.decode()}")
-                if stderr:
-                    logging.error(f"Launch stderr: {stderr.decode()}")
+                # Ask LaunchServices for a new instance directly and quit once it's up
+                config = AppKit.NSWorkspaceOpenConfiguration.configuration()
+                config.setCreatesNewApplicationInstance_(True)
                 
-                # Small delay to ensure new instance starts
-                logging.info("Waiting for new instance to start...")
-                time.sleep(0.5)
+                def launched(app, error):
+                    if error is not None:
+                        logger.error("Failed to launch new instance: %s", error)
+                    else:
+                        logger.info("New instance launched, terminating current instance")
+                    stop_file_logging()
+                    AppKit.NSOperationQueue.mainQueue().addOperationWithBlock_(
+                        lambda: AppKit.NSApp.terminate_(None)
+                    )
                 
-                # Now terminate current instance
-                logging.info("Terminating current instance...")
-                AppKit.NSApp.terminate_(None)
+                AppKit.NSWorkspace.sharedWorkspace().openApplicationAtURL_configuration_completionHandler_(
+                    AppKit.NSURL.fileURLWithPath_(bundle_path), config, launched
+                )
             else:
                 # Development mode
-                script_dir = os.path.dirname(os.path.abspath(__file__))
-                main_script = os.path.join(script_dir, 'audio_recorder.py')
-                logging.info(f"Development mode, launching: {main_script}")
-                logging.info(f"Current executable: {sys.executable}")
-                logging.info(f"Current working directory: {os.getcwd()}")
+                main_script = MAIN_SCRIPT
+                logger.info("Development mode, launching: %s", main_script)
+                logger.info("Current executable: %s", sys.executable)
+                logger.info("Current working directory: %s", os.getcwd())
+                stop_file_logging()
                 os.execv(sys.executable, ['python3', main_script])
                 
         except Exception as e:
-            logging.error(f"Failed to restart app: {e}")
-            logging.error(f"Exception type: {type(e)}")
-            logging.error(f"Exception details: {str(e)}")
-            logging.error("Full traceback:")
-            logging.error(traceback.format_exc())
+            logger.exception("Failed to restart app (%s): %s", type(e).__name__, e)
+            stop_file_logging()
             AppKit.NSApp.terminate_(None)
 
     def skipGuide_(self, sender):
         """Handler for Skip Guide button"""
-        logging.info("Skip Guide button pressed - initiating app restart")
+        logger.info("Skip Guide button pressed - initiating app restart")
         self.videoDidFinish_(None)  # Reuse the same logic
 
-    def open_audio_midi_setup(self):
-        try:
-            # First, position our setup wizard window to the left edge
-            screen = AppKit.NSScreen.mainScreen()
-            screen_frame = screen.visibleFrame()
-            
-            # Get our window
-            our_window = AppKit.NSApp.mainWindow()
-            our_frame = our_window.frame()
-            
-            # Calculate position for our window (left edge, maintaining vertical position)
-            new_x = screen_frame.origin.x + 20  # 20px padding from left edge
-            new_y = our_frame.origin.y  # Keep current vertical position
-            
-            # Move our window
-            our_window.setFrame_display_animate_(
-                AppKit.NSMakeRect(new_x, new_y, our_frame.size.width, our_frame.size.height),
-                True, True
-            )
-            
-            # Open Audio MIDI Setup
-            subprocess.run(['open', '-a', 'Audio MIDI Setup'])
-            
-            # Give Audio MIDI Setup a moment to open
-            time.sleep(0.5)
-            
-            # Find Audio MIDI Setup window
-            audio_midi_app = AppKit.NSRunningApplication.runningApplicationsWithBundleIdentifier_("com.apple.AudioMIDISetup")[0]
-            audio_midi_app.activateWithOptions_(AppKit.NSApplicationActivateIgnoringOtherApps)
-            
-            # Use AppleScript to position the Audio MIDI Setup window
-            apple_script = f'''
-                tell application "Audio MIDI Setup"
-                    activate
-                    tell application "System Events"
-                        tell process "Audio MIDI Setup"
-                            set position of window 1 to {{{our_frame.size.width + new_x + 20}, {new_y}}}
-                        end tell
-                    end tell
-                end tell
-            '''
-            
-            subprocess.run(['osascript', '-e', apple_script])
-            
-            # Bring our window back to front
-            our_window.makeKeyAndOrderFront_(None)
-            
-        except Exception as e:
-            logging.error(f"Error positioning windows: {e}")
-            # Fallback to just opening Audio MIDI Setup
-            subprocess.run(['open', '-a', 'Audio MIDI Setup'])
-
-    def play_video(self):
-        try:
-            video_path = resource_path('resources/setup/guide.mp4')
-            logging.info(f"Loading video from path: {video_path}")
-            
-            if not os.path.exists(video_path):
-                logging.error(f"Video file not found at path: {video_path}")
-                return
-                
-            # Create a temporary directory with proper permissions
-            temp_dir = tempfile.mkdtemp()
-            temp_video_path = os.path.join(temp_dir, 'guide.mp4')
-            
-            try:
-                # Copy the video file to temp directory
-                shutil.copy2(video_path, temp_video_path)
-                # Ensure permissions are correct
-                os.chmod(temp_video_path, 0o644)
-                logging.info(f"Copied video to temporary location: {temp_video_path}")
-            except Exception as e:
-                logging.error(f"Failed to copy video to temp location: {e}")
-                shutil.rmtree(temp_dir, ignore_errors=True)
-                return
-            
-            video_url = Foundation.NSURL.fileURLWithPath_(temp_video_path)
-            logging.info(f"Created video URL: {video_url}")
-            
-            self.player = AVKit.AVPlayer.playerWithURL_(video_url)
-            if not self.player:
-                logging.error("Failed to create AVPlayer")
-                shutil.rmtree(temp_dir, ignore_errors=True)
-                return
-            
-            # Store temp directory path for cleanup
-            self.temp_video_dir = temp_dir
-            
-            # Create the player view with the same frame as the container
-            self.player_view = AVKit.AVPlayerView.alloc().initWithFrame_(
-                self.video_container.frame()
-            )
-            if not self.player_view:
-                logging.error("Failed to create AVPlayerView")
-                shutil.rmtree(temp_dir, ignore_errors=True)
-                return
-            
-            self.player_view.setPlayer_(self.player)
-            
-            # Remove any existing subviews from the container
-            for subview in self.video_container.subviews():
-                subview.removeFromSuperview()
-                
-            # Add player view to the container
-            self.video_container.addSubview_(self.player_view)
-            
-            # Add observer for playback status
-            self.player.addObserver_forKeyPath_options_context_(
-                self, "status", Foundation.NSKeyValueObservingOptionNew, None)
-            
-            # Play the video
-            self.player.play()
-            logging.info("Video playback started")
-            
-        except Exception as e:
-            logging.error(f"Error playing video: {e}")
-            logging.error(traceback.format_exc())
-            if hasattr(self, 'temp_video_dir'):
-                shutil.rmtree(self.temp_video_dir, ignore_errors=True)
-
-    def observeValueForKeyPath_ofObject_change_context_(self, keyPath, obj, change, context):
-        if keyPath == "status":
-            status = obj.status()
-            if status == AVFoundation.AVPlayerStatusFailed:
-                error = obj.error()
-                logging.error(f"Player failed with error: {error}")
-            elif status == AVFoundation.AVPlayerStatusReadyToPlay:
-                logging.info("Player is ready to play")
-            elif status == AVFoundation.AVPlayerStatusUnknown:
-                logging.info("Player status is unknown")
-
-    def create_window(self):
-        try:
-            # Create the window
-            self.window = AppKit.NSWindow.alloc().initWithContentRect_styleMask_backing_defer_(
-                AppKit.NSMakeRect(0, 0, 800, 600),
-                AppKit.NSWindowStyleMaskTitled |
-                AppKit.NSWindowStyleMaskClosable |
-                AppKit.NSWindowStyleMaskMiniaturizable,
-                AppKit.NSBackingStoreBuffered,
-                False
-            )
-            
-            self.window.setTitle_("SoundGrabber Setup")
-            
-            # Store content view for later use
-            self.content_view = self.window.contentView()
-            
-            # Create video container view
-            self.video_container = AppKit.NSView.alloc().initWithFrame_(
-                AppKit.NSMakeRect(40, 100, 720, 405)
-            )
-            self.content_view.addSubview_(self.video_container)
-            
-            # Center window on screen
-            self.window.center()
-            
-            # Set up the window delegate
-            self.delegate = WindowDelegate.alloc().init()
-            self.window.setDelegate_(self.delegate)
-            
-            logging.info("Setup wizard window created successfully")
-            
-        except Exception as e:
-            logging.error(f"Error creating window: {e}")
-            logging.error(traceback.format_exc())
-
-    def dealloc(self):
-        # Remove observer when the window is closed
-        if hasattr(self, 'player'):
-            self.player.removeObserver_forKeyPath_(self, "status")
-        # Clean up temporary directory
-        if hasattr(self, 'temp_video_dir'):
-            shutil.rmtree(self.temp_video_dir, ignore_errors=True)
-        super().dealloc()
-
 if __name__ == "__main__":
     app = AppKit.NSApplication.sharedApplication()
     wizard = SetupWizard()
     wizard.show()
-    app.run() 
\ No newline at end of file
+    if not wizard.already_done:
+        app.run() 
\ No newline at end of file
@@ -3,6 +3,17 @@ import AppKit
 import logging
 import time
 
+def _wait_for_device(name, timeout=10.0, interval=0.25):
+    """Poll SwitchAudioSource until name shows up, or give up after timeout seconds"""
+    deadline = time.monotonic() + timeout
+    while True:
+        result = subprocess.run(['SwitchAudioSource', '-a'], capture_output=True, text=True)
+        if name in result.stdout:
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+
 def test_create_multi_output():
     try:
         # First check if device already exists
@@ -15,11 +26,8 @@ def test_create_multi_output():
             
         print("Creating new Multi-Output Device...")
         
-        # Open Audio MIDI Setup directly
-        subprocess.run(['open', '-a', 'Audio MIDI Setup'])
-        
-        # Wait for Audio MIDI Setup to open
-        time.sleep(1)  # Add 1 second delay
+        # Open Audio MIDI Setup directly, returns once it's launched
+        AppKit.NSWorkspace.sharedWorkspace().launchApplication_("Audio MIDI Setup")
         
         # Show instructions
         alert = AppKit.NSAlert.alloc().init()
@@ -34,11 +42,8 @@ def test_create_multi_output():
         alert.addButtonWithTitle_("OK")
         alert.runModal()
         
-        # Wait and verify
-        time.sleep(2)
-        check_cmd = ['SwitchAudioSource', '-a']
-        result = subprocess.run(check_cmd, capture_output=True, text=True)
-        if "SoundGrabber" in result.stdout:
+        # Verify as soon as the device shows up instead of after a fixed delay
+        if _wait_for_device("SoundGrabber"):
             print("Successfully verified device creation!")
             
             # Show success message